@@ -1,9 +1,23 @@
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from gspread.utils import absolute_range_name, numericise, numericise_all, rowcol_to_a1
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import parse_etags, quote_etag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import random
+import re
 import datetime
+import hashlib
+import time
+import threading
 import os.path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson # Optional: faster JSON encoding for API responses
+except ImportError:
+    orjson = None
 
 # --- <<< NEW: Google Drive Imports >>> ---
 from googleapiclient.discovery import build
@@ -25,10 +39,26 @@ except ImportError:
 CRED_FILE = "credentials.json"
 # --- G-SHEET & G-DRIVE SETUP ---
 SCOPES = ["https://spreadsheets.google.com/feeds", 'https://www.googleapis.com/auth/drive']
+DRIVE_RETRIES = 3 # googleapiclient retries 429/5xx with exponential backoff
 
-# --- G-Sheet Client (Old way) ---
-gs_creds = ServiceAccountCredentials.from_json_keyfile_name(CRED_FILE, SCOPES)
-gs_client = gspread.authorize(gs_creds)
+# --- Credentials (shared by G-Sheet and G-Drive, so tokens are refreshed once) ---
+try:
+    creds = Credentials.from_service_account_file(CRED_FILE, scopes=SCOPES)
+except FileNotFoundError:
+    print(f"FATAL ERROR: credentials.json not found.")
+    print("Please add your credentials.json file to the project folder.")
+    exit()
+
+# --- G-Sheet Client ---
+gs_client = gspread.authorize(creds)
+
+# Pool connections across the server threads and back off on quota/transient errors
+_gs_session = getattr(gs_client, "http_client", gs_client).session
+_gs_session.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+))
 try:
     sheet = gs_client.open_by_url(SHEET_URL)
 except gspread.exceptions.SpreadsheetNotFound:
@@ -36,14 +66,8 @@ except gspread.exceptions.SpreadsheetNotFound:
     print("Please check SHEET_URL in config.py")
     exit()
 
-# --- G-Drive Client (New way) ---
-try:
-    drive_creds = Credentials.from_service_account_file(CRED_FILE, scopes=SCOPES)
-    drive_service = build('drive', 'v3', credentials=drive_creds)
-except FileNotFoundError:
-    print(f"FATAL ERROR: credentials.json not found.")
-    print("Please add your credentials.json file to the project folder.")
-    exit()
+# --- G-Drive Client ---
+drive_service = build('drive', 'v3', credentials=creds)
 
 try:
     projects_sheet = sheet.worksheet("Projects")
@@ -52,18 +76,87 @@ except gspread.exceptions.WorksheetNotFound:
     print("FATAL ERROR: Please create 'Projects' and 'WorkOrders' tabs in your G-Sheet.")
     exit()
 
+# Header rows are cached per worksheet so lookups and updates don't re-read them
+_HEADERS = {}
+_COL_INDEX = {}
+
+def _get_headers(worksheet):
+    """Returns the cached header row for a worksheet, reading it on first use."""
+    headers = _HEADERS.get(worksheet.title)
+    if headers is None:
+        headers = worksheet.row_values(1)
+        _HEADERS[worksheet.title] = headers
+        _COL_INDEX[worksheet.title] = {h: i + 1 for i, h in enumerate(headers)}
+    return headers
+
+def _get_col_index(worksheet):
+    """Returns the cached {header: column number} map for a worksheet."""
+    _get_headers(worksheet)
+    return _COL_INDEX[worksheet.title]
+
+for _ws in (projects_sheet, workorders_sheet):
+    _get_headers(_ws)
+
+# The API is served by a threaded WSGI server: writes to a worksheet are serialized
+# per sheet, and Drive calls share one lock because httplib2 is not thread-safe.
+# Reentrant so a read-check-write sequence can hold its sheet's lock around update_cells.
+_SHEET_LOCKS = {ws.title: threading.RLock() for ws in (projects_sheet, workorders_sheet)}
+_DRIVE_LOCK = threading.Lock()
+
 # --- FLASK API SETUP ---
+class ORJSONProvider(DefaultJSONProvider):
+    """Serializes jsonify() responses and parses request bodies with orjson."""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if orjson:
+    app.json = ORJSONProvider(app)
 
 # --- Helper Functions ---
+# {sheet title: {key header: {value: row number}}}, built from one column read
+_ROW_INDEX = {}
+
+def _build_row_index(worksheet, key):
+    """Reads the key column once and maps each value to its G-Sheet row number."""
+    column_values = worksheet.col_values(_get_col_index(worksheet)[key])
+    index = {}
+    for i, value in enumerate(column_values[1:]):
+        if value:
+            index.setdefault(value, i + 2)  # First match wins, like the old linear scan
+    _ROW_INDEX.setdefault(worksheet.title, {})[key] = index
+    return index
+
+def _read_row(worksheet, row_num):
+    """Fetches a single row as a {header: value} dict."""
+    headers = _get_headers(worksheet)
+    row = worksheet.row_values(row_num)
+    row += [""] * (len(headers) - len(row))  # Trailing blanks are trimmed by the API
+    return dict(zip(headers, numericise_all(row)))
+
 def find_row(worksheet, key, value):
     """Finds a row in a worksheet by matching a key (column header) and value."""
     try:
-        all_data = worksheet.get_all_records(head=1)
-        for i, row in enumerate(all_data):
-            if str(row.get(key)) == str(value):
-                return row, i + 2  # Return the row data and the G-Sheet row number
-        return None, None
+        target = str(value)
+        index = _ROW_INDEX.get(worksheet.title, {}).get(key)
+        cached = index is not None
+        if not cached:
+            index = _build_row_index(worksheet, key)
+
+        row_num = index.get(target)
+        row_data = _read_row(worksheet, row_num) if row_num else None
+        if cached and (row_data is None or str(row_data.get(key)) != target):
+            # Rows were added or moved outside this API (e.g. edited by hand): rebuild once
+            index = _build_row_index(worksheet, key)
+            row_num = index.get(target)
+            row_data = _read_row(worksheet, row_num) if row_num else None
+
+        if row_data is None:
+            return None, None
+        return row_data, row_num
     except Exception as e:
         print(f"API HELPER ERROR (find_row): {e}")
         return None, None
@@ -71,20 +164,118 @@ def find_row(worksheet, key, value):
 def update_cells(worksheet, row_num, headers_to_update: dict):
     """Updates a batch of cells in a specific row."""
     try:
-        headers = worksheet.row_values(1)
-        cells_to_update = []
+        col_index = _get_col_index(worksheet)
+        values_by_col = {}
         for key, value in headers_to_update.items():
-            if key in headers:
-                col = headers.index(key) + 1
-                cells_to_update.append(gspread.Cell(row_num, col, str(value)))
-        if cells_to_update:
-            worksheet.update_cells(cells_to_update)
+            col = col_index.get(key)
+            if col:
+                values_by_col[col] = str(value)
+        if not values_by_col:
+            return True
+
+        # Collapse contiguous columns into runs so the whole row goes out in one request
+        runs = []
+        for col in sorted(values_by_col):
+            if runs and runs[-1][-1] == col - 1:
+                runs[-1].append(col)
+            else:
+                runs.append([col])
+
+        data = [
+            {
+                "range": absolute_range_name(worksheet.title, f"{rowcol_to_a1(row_num, run[0])}:{rowcol_to_a1(row_num, run[-1])}"),
+                "values": [[values_by_col[col] for col in run]]
+            }
+            for run in runs
+        ]
+        # Straight to values.batchUpdate: one HTTP call, no Cell objects
+        # RAW keeps ISO timestamps as plain strings instead of letting Sheets parse them
+        with _SHEET_LOCKS[worksheet.title]:
+            worksheet.spreadsheet.values_batch_update(body={"valueInputOption": "RAW", "data": data})
+            _invalidate(worksheet)
         return True
     except Exception as e:
         print(f"API HELPER ERROR (update_cells): {e}")
         return False
 
+# --- Read Cache ---
+# List endpoints are polled by both bots; reads are served from memory for a short
+# window and every write through this API bumps the sheet's version to drop them.
+RECORDS_TTL_SECONDS = 30
+_RECORDS_CACHE = {}
+_SHEET_VERSION = {}
+
+def _invalidate(worksheet):
+    """Marks every cached read of a worksheet as stale."""
+    _SHEET_VERSION[worksheet.title] = _SHEET_VERSION.get(worksheet.title, 0) + 1
+
+def _cached_read(worksheet, key, loader):
+    """Returns loader() for a worksheet, reusing the result until the TTL expires or the sheet is written."""
+    version = _SHEET_VERSION.get(worksheet.title, 0)
+    bucket = int(time.time() // RECORDS_TTL_SECONDS)
+    cache_key = (worksheet.title, key)
+    cached = _RECORDS_CACHE.get(cache_key)
+    if cached and cached[0] == (version, bucket):
+        return cached[1]
+    result = loader()
+    _RECORDS_CACHE[cache_key] = ((version, bucket), result)
+    return result
+
+def get_records_by_status(worksheet, statuses):
+    """Returns records whose Status is in statuses, downloading only the Status column and matching rows."""
+    statuses = tuple(sorted(statuses))
+
+    def load():
+        headers = _get_headers(worksheet)
+        status_values = worksheet.col_values(_get_col_index(worksheet)["Status"])
+        matching_rows = [i + 1 for i, value in enumerate(status_values) if i > 0 and value in statuses]
+        if not matching_rows:
+            return []
+        last_col = len(headers)
+        ranges = [f"{rowcol_to_a1(r, 1)}:{rowcol_to_a1(r, last_col)}" for r in matching_rows]
+        records = []
+        for value_range in worksheet.batch_get(ranges):
+            row = list(value_range[0]) if value_range else []
+            row += [""] * (last_col - len(row))
+            records.append(dict(zip(headers, numericise_all(row))))
+        return records
+
+    return _cached_read(worksheet, ("status", statuses), load)
+
+def append_row(worksheet, row):
+    """Appends a row and invalidates cached reads of the worksheet."""
+    append_rows(worksheet, [row])
+
+def append_rows(worksheet, rows):
+    """Appends several rows in one request and invalidates cached reads of the worksheet."""
+    with _SHEET_LOCKS[worksheet.title]:
+        worksheet.append_rows(rows, value_input_option='USER_ENTERED')
+        _invalidate(worksheet)
+        _ROW_INDEX.pop(worksheet.title, None)
+
+def conditional_jsonify(payload, etag=None):
+    """jsonify() with an ETag; answers 304 with no body if the client's If-None-Match still matches."""
+    response = jsonify(payload)
+    if etag:
+        response.set_etag(etag)
+    else:
+        response.add_etag()
+    return response.make_conditional(request)
+
+def row_etag(row_data):
+    """ETag for a sheet row. Every value goes through the same numericise() the reads use, so a
+    row just merged in memory (raw strings like "007" or "1.50") tags the same as that row read back."""
+    return hashlib.sha1(repr(sorted((k, str(numericise(str(v)))) for k, v in row_data.items())).encode()).hexdigest()
+
 # --- <<< NEW: Google Drive Helpers >>> ---
+# Matches .../folders/<id>?usp=sharing as well as ...open?id=<id>
+_FOLDER_ID_RE = re.compile(r'(?:folders/|id=)([A-Za-z0-9_-]+)')
+
+def _extract_folder_id(url):
+    """Pulls the folder ID out of a G-Drive folder URL, or None if there isn't one."""
+    match = _FOLDER_ID_RE.search(url or '')
+    return match.group(1) if match else None
+
 def create_gdrive_folder(name, parent_folder_id):
     """Creates a new folder in Google Drive."""
     try:
@@ -93,7 +284,8 @@ def create_gdrive_folder(name, parent_folder_id):
             'parents': [parent_folder_id],
             'mimeType': 'application/vnd.google-apps.folder'
         }
-        folder = drive_service.files().create(body=file_metadata, fields='id, webViewLink').execute()
+        with _DRIVE_LOCK:
+            folder = drive_service.files().create(body=file_metadata, fields='id, webViewLink').execute(num_retries=DRIVE_RETRIES)
         return folder.get('id'), folder.get('webViewLink')
     except HttpError as e:
         print(f"API GDRIVE ERROR (create_folder): {e}")
@@ -105,17 +297,21 @@ def create_gdrive_folder(name, parent_folder_id):
 def move_gdrive_folder(folder_id, new_parent_id, old_parent_id):
     """Moves a G-Drive folder to a new parent (e.g., to 'Finished')."""
     try:
-        file = drive_service.files().update(
-            fileId=folder_id,
-            addParents=new_parent_id,
-            removeParents=old_parent_id,
-            fields='id, parents'
-        ).execute()
+        with _DRIVE_LOCK:
+            file = drive_service.files().update(
+                fileId=folder_id,
+                addParents=new_parent_id,
+                removeParents=old_parent_id,
+                fields='id, parents'
+            ).execute(num_retries=DRIVE_RETRIES)
         return True
     except HttpError as e:
         print(f"API GDRIVE ERROR (move_folder): {e}")
         return False
 
+# Runs independent Drive calls alongside G-Sheet writes within a single request
+_IO_POOL = ThreadPoolExecutor(max_workers=4)
+
 # --- ================================== ---
 # --- PROJECT ENDPOINTS
 # --- ================================== ---
@@ -145,7 +341,7 @@ def create_project():
             str(data['AccountableID']),
             folder_url
         ]
-        projects_sheet.append_row(new_row, value_input_option='USER_ENTERED')
+        append_row(projects_sheet, new_row)
         
         new_project_data, _ = find_row(projects_sheet, "ProjectID", project_id)
         return jsonify({"status": "success", "project": new_project_data}), 201
@@ -159,7 +355,7 @@ def get_project(project_id):
     row_data, row_num = find_row(projects_sheet, "ProjectID", project_id)
     if not row_data:
         return jsonify({"status": "error", "message": "Project not found"}), 404
-    return jsonify({"status": "success", "project": row_data}), 200
+    return conditional_jsonify({"status": "success", "project": row_data})
 
 @app.route('/project/<string:project_id>', methods=['PUT'])
 def update_project(project_id):
@@ -175,8 +371,8 @@ def update_project(project_id):
     if not update_cells(projects_sheet, row_num, headers_to_update):
         return jsonify({"status": "error", "message": "Failed to update G-Sheet cells"}), 500
         
-    updated_data, _ = find_row(projects_sheet, "ProjectID", project_id)
-    return jsonify({"status": "success", "project": updated_data}), 200
+    row_data.update(headers_to_update)
+    return jsonify({"status": "success", "project": row_data}), 200
 
 @app.route('/project/<string:project_id>/finish', methods=['PUT'])
 def finish_project(project_id):
@@ -184,36 +380,61 @@ def finish_project(project_id):
     if not row_data:
         return jsonify({"status": "error", "message": "Project not found"}), 404
         
-    # 1. Move G-Drive Folder
+    # 1. Move G-Drive Folder (in the background, it doesn't depend on the sheet)
+    move_future = None
     try:
-        folder_url = row_data.get('DriveFolderURL')
-        if folder_url:
-            folder_id = folder_url.split('/')[-1].split('?')[0] # Handle different URL formats
-            move_gdrive_folder(folder_id, FINISHED_PROJECTS_FOLDER_ID, ACTIVE_PROJECTS_FOLDER_ID)
-            print(f"API: Moved G-Drive folder for {project_id} to Finished.")
+        folder_id = _extract_folder_id(row_data.get('DriveFolderURL'))
+        if folder_id:
+            move_future = _IO_POOL.submit(move_gdrive_folder, folder_id, FINISHED_PROJECTS_FOLDER_ID, ACTIVE_PROJECTS_FOLDER_ID)
     except Exception as e:
         print(f"API WARNING (finish_project): Could not move G-Drive folder. {e}")
 
     # 2. Update G-Sheet
     finish_date = datetime.date.today().isoformat()
     headers_to_update = {"Status": "Finished", "DueDate": finish_date}
-    
-    if not update_cells(projects_sheet, row_num, headers_to_update):
+    updated = update_cells(projects_sheet, row_num, headers_to_update)
+
+    if move_future:
+        try:
+            if move_future.result():
+                print(f"API: Moved G-Drive folder for {project_id} to Finished.")
+        except Exception as e:
+            print(f"API WARNING (finish_project): Could not move G-Drive folder. {e}")
+
+    if not updated:
         return jsonify({"status": "error", "message": "Failed to update G-Sheet cells"}), 500
         
-    updated_data, _ = find_row(projects_sheet, "ProjectID", project_id)
-    return jsonify({"status": "success", "project": updated_data}), 200
+    row_data.update(headers_to_update)
+    return jsonify({"status": "success", "project": row_data}), 200
 
 @app.route('/projects/active', methods=['GET'])
 def get_active_projects():
-    all_data = projects_sheet.get_all_records()
-    active_projects = [p for p in all_data if p.get('Status') == 'Active']
+    active_projects = get_records_by_status(projects_sheet, {"Active"})
     return jsonify({"status": "success", "projects": active_projects}), 200
 
 # --- ================================== ---
 # --- WORK ORDER ENDPOINTS
 # --- ================================== ---
 
+def _new_work_order_row(project_id, data, subfolder_url=""):
+    """Builds the G-Sheet row for a new work order, returning (WorkOrderID, row)."""
+    wo_id = f"wo-{project_id.split('-')[-1]}-{random.randint(100, 999)}"
+    new_row = [
+        wo_id,
+        project_id,
+        str(data['ThreadID']),
+        "Open", # Status
+        data['Title'],
+        data['Deliverables'],
+        str(data.get('PushedToUserID') or ""),
+        "", # InProgressUserID
+        "", # QA_SubmittedByID
+        "", # CurrentStartTime
+        0,  # TotalTimeSeconds
+        subfolder_url or ""
+    ]
+    return wo_id, new_row
+
 @app.route('/workorder', methods=['POST'])
 def create_work_order():
     data = request.json
@@ -224,34 +445,18 @@ def create_work_order():
             return jsonify({"status": "error", "message": "Parent project not found"}), 404
         
         # 2. Create G-Drive Subfolder
-        parent_folder_url = project_data.get('DriveFolderURL')
+        parent_folder_id = _extract_folder_id(project_data.get('DriveFolderURL'))
         subfolder_url = ""
-        if parent_folder_url:
-            parent_folder_id = parent_folder_url.split('/')[-1].split('?')[0] # Handle different URL formats
+        if parent_folder_id:
             _, subfolder_url = create_gdrive_folder(data['Title'], parent_folder_id)
             if not subfolder_url:
                 print("API WARNING: Could not create G-Drive subfolder.")
         
         # 3. Create Work Order in G-Sheet
-        wo_id = f"wo-{data['ProjectID'].split('-')[-1]}-{random.randint(100, 999)}"
-        new_row = [
-            wo_id,
-            data['ProjectID'],
-            str(data['ThreadID']),
-            "Open", # Status
-            data['Title'],
-            data['Deliverables'],
-            str(data['PushedToUserID'] or ""),
-            "", # InProgressUserID
-            "", # QA_SubmittedByID
-            "", # CurrentStartTime
-            0   # TotalTimeSeconds
-        ]
-        workorders_sheet.append_row(new_row, value_input_option='USER_ENTERED')
+        wo_id, new_row = _new_work_order_row(data['ProjectID'], data, subfolder_url)
+        append_row(workorders_sheet, new_row)
         
         new_wo_data, _ = find_row(workorders_sheet, "WorkOrderID", wo_id)
-        # We must add the subfolder URL manually as it's not in the sheet
-        new_wo_data['SubfolderURL'] = subfolder_url 
         
         return jsonify({"status": "success", "workorder": new_wo_data}), 201
         
@@ -265,82 +470,53 @@ def get_work_order(wo_id):
     if not row_data:
         return jsonify({"status": "error", "message": "Work order not found"}), 404
         
-    # We must manually add the G-Drive subfolder URL
-    try:
-        project_data, _ = find_row(projects_sheet, "ProjectID", row_data['ProjectID'])
-        parent_folder_url = project_data.get('DriveFolderURL')
-        subfolder_url = ""
-        if parent_folder_url:
-            parent_folder_id = parent_folder_url.split('/')[-1].split('?')[0] # Handle different URL formats
-            # This is slow, but the only way to find it
-            q = f"'{parent_folder_id}' in parents and name='{row_data['Title']}' and mimeType='application/vnd.google-apps.folder'"
-            response = drive_service.files().list(q=q, fields='files(id, webViewLink)').execute()
-            files = response.get('files', [])
-            if files:
-                subfolder_url = files[0].get('webViewLink')
-        row_data['SubfolderURL'] = subfolder_url
-    except Exception as e:
-        print(f"API WARNING (get_work_order): Could not find G-Drive subfolder. {e}")
-        row_data['SubfolderURL'] = ""
-        
-    return jsonify({"status": "success", "workorder": row_data}), 200
+    return conditional_jsonify({"status": "success", "workorder": row_data}, etag=row_etag(row_data))
 
 @app.route('/workorder/<string:wo_id>', methods=['PUT'])
 def update_work_order(wo_id):
-    data = request.json
-    row_data, row_num = find_row(workorders_sheet, "WorkOrderID", wo_id)
-    if not row_data:
-        return jsonify({"status": "error", "message": "Work order not found"}), 404
-    
-    allowed_headers = ["Title", "Deliverables", "PushedToUserID"]
-    headers_to_update = {k: v for k, v in data.items() if k in allowed_headers}
-    
-    if not update_cells(workorders_sheet, row_num, headers_to_update):
-        return jsonify({"status": "error", "message": "Failed to update G-Sheet cells"}), 500
-        
-    updated_data, _ = find_row(workorders_sheet, "WorkOrderID", wo_id)
-    return jsonify({"status": "success", "workorder": updated_data}), 200
+    return _transition_response(wo_id, "update")
 
 @app.route('/workorders/inprogress', methods=['GET'])
 def get_in_progress_work_orders():
-    all_data = workorders_sheet.get_all_records()
-    in_progress = [w for w in all_data if w.get('Status') == 'InProgress']
+    in_progress = get_records_by_status(workorders_sheet, {"InProgress"})
     return jsonify({"status": "success", "workorders": in_progress}), 200
 
 @app.route('/workorders/active', methods=['GET'])
 def get_active_work_orders():
     """Return work orders that are still actionable in Discord."""
-    all_data = workorders_sheet.get_all_records()
     active_statuses = {"Open", "InProgress", "InQA", "Rework"}
-    active_wos = [w for w in all_data if w.get('Status') in active_statuses and w.get('Status') != 'Cancelled']
+    active_wos = get_records_by_status(workorders_sheet, active_statuses)
     return jsonify({"status": "success", "workorders": active_wos}), 200
 
-@app.route('/workorder/<string:wo_id>/start', methods=['PUT'])
-def start_work_order(wo_id):
-    data = request.json
-    user_id = str(data['UserID'])
+# --- Status transitions ---
+# Each writes one transition to a work order row and returns (changes, error), where
+# error is a (status_code, message) pair when the transition is refused.
 
-    row_data, row_num = find_row(workorders_sheet, "WorkOrderID", wo_id)
-    if not row_data:
-        return jsonify({"status": "error", "message": "Work order not found"}), 404
-        
+def _write_changes(row_data, row_num, headers):
+    """Writes a transition's fields in one request; the row only changes if the write did."""
+    if not update_cells(workorders_sheet, row_num, headers):
+        return None, (500, "Failed to update G-Sheet cells")
+    row_data.update(headers)
+    return headers, None
+
+def _start_transition(row_data, row_num, data):
+    user_id = str(data['UserID'])
     pushed_to = str(row_data.get('PushedToUserID') or "")
     if pushed_to and pushed_to != user_id:
-        return jsonify({"status": "error", "message": "This work order is assigned to another user."}), 403
+        return None, (403, "This work order is assigned to another user.")
         
     headers = {
         "Status": "InProgress",
         "InProgressUserID": user_id,
         "CurrentStartTime": datetime.datetime.now(datetime.timezone.utc).isoformat()
     }
-    update_cells(workorders_sheet, row_num, headers)
-    return jsonify({"status": "success"}), 200
+    return _write_changes(row_data, row_num, headers)
 
-def _log_time(row_data, row_num):
-    """Helper to calculate and log time, returning the total time."""
+def _log_time(row_data):
+    """Helper to calculate the running session's time, returning the fields to write."""
     start_time_str = row_data.get('CurrentStartTime')
     if not start_time_str:
-        return int(row_data.get('TotalTimeSeconds') or 0) # Return existing time
+        return {} # No session running
         
     start_time = datetime.datetime.fromisoformat(start_time_str)
     time_spent = (datetime.datetime.now(datetime.timezone.utc) - start_time).total_seconds()
@@ -348,106 +524,150 @@ def _log_time(row_data, row_num):
     total_spent = float(row_data.get('TotalTimeSeconds', 0))
     new_total_time = round(time_spent + total_spent)
     
-    headers = {
+    return {
         "TotalTimeSeconds": new_total_time,
         "CurrentStartTime": "",
         "InProgressUserID": ""
     }
-    update_cells(workorders_sheet, row_num, headers)
-    return new_total_time
 
-@app.route('/workorder/<string:wo_id>/pause', methods=['PUT'])
-def pause_work_order(wo_id):
-    row_data, row_num = find_row(workorders_sheet, "WorkOrderID", wo_id)
-    if not row_data:
-        return jsonify({"status": "error", "message": "Work order not found"}), 404
+def _pause_transition(row_data, row_num, data):
+    headers = _log_time(row_data) # Log time and clear user
+    headers["Status"] = "Open"
+    return _write_changes(row_data, row_num, headers)
 
-    _log_time(row_data, row_num) # Log time and clear user
-    update_cells(workorders_sheet, row_num, {"Status": "Open"})
-    return jsonify({"status": "success"}), 200
-
-@app.route('/workorder/<string:wo_id>/cancel', methods=['PUT'])
-def cancel_work_order(wo_id):
-    row_data, row_num = find_row(workorders_sheet, "WorkOrderID", wo_id)
-    if not row_data:
-        return jsonify({"status": "error", "message": "Work order not found"}), 404
-
-    _log_time(row_data, row_num)
-    headers = {
+def _cancel_transition(row_data, row_num, data):
+    headers = _log_time(row_data)
+    headers.update({
         "Status": "Cancelled",
         "InProgressUserID": "",
         "CurrentStartTime": "",
         "QA_SubmittedByID": ""
-    }
-    update_cells(workorders_sheet, row_num, headers)
-
-    updated_data, _ = find_row(workorders_sheet, "WorkOrderID", wo_id)
-    return jsonify({"status": "success", "workorder": updated_data}), 200
+    })
+    return _write_changes(row_data, row_num, headers)
 
-@app.route('/workorder/<string:wo_id>/finish', methods=['PUT'])
-def finish_work_order(wo_id):
-    data = request.json
+def _finish_transition(row_data, row_num, data):
     user_id = str(data['UserID']) # This is the user who hit "Finish"
-
-    row_data, row_num = find_row(workorders_sheet, "WorkOrderID", wo_id)
-    if not row_data:
-        return jsonify({"status": "error", "message": "Work order not found"}), 404
-        
-    _log_time(row_data, row_num) # Log time and clear user
-    headers = {
+    headers = _log_time(row_data) # Log time and clear user
+    headers.update({
         "Status": "InQA",
         "QA_SubmittedByID": user_id
-    }
-    update_cells(workorders_sheet, row_num, headers)
-    return jsonify({"status": "success"}), 200
+    })
+    return _write_changes(row_data, row_num, headers)
 
-@app.route('/workorder/<string:wo_id>/approve', methods=['PUT'])
-def approve_work_order(wo_id):
-    row_data, row_num = find_row(workorders_sheet, "WorkOrderID", wo_id)
-    if not row_data:
-        return jsonify({"status": "error", "message": "Work order not found"}), 404
-    
+def _approve_transition(row_data, row_num, data):
     headers = {
         "Status": "Approved",
         "InProgressUserID": "",
         "CurrentStartTime": "",
         "QA_SubmittedByID": ""
     }
-    update_cells(workorders_sheet, row_num, headers)
-    return jsonify({"status": "success"}), 200
-
-@app.route('/workorder/<string:wo_id>/rework', methods=['PUT'])
-def rework_work_order(wo_id):
-    row_data, row_num = find_row(workorders_sheet, "WorkOrderID", wo_id)
-    if not row_data:
-        return jsonify({"status": "error", "message": "Work order not found"}), 404
+    return _write_changes(row_data, row_num, headers)
 
+def _rework_transition(row_data, row_num, data):
     headers = {
         "Status": "Open",
         "InProgressUserID": "",
         "CurrentStartTime": "",
         "QA_SubmittedByID": ""
     }
-    update_cells(workorders_sheet, row_num, headers)
-    return jsonify({"status": "success"}), 200
+    return _write_changes(row_data, row_num, headers)
+
+def _update_transition(row_data, row_num, data):
+    """Field edits from the edit modal; batched alongside the status transitions."""
+    allowed_headers = ["Title", "Deliverables", "PushedToUserID"]
+    headers_to_update = {k: v for k, v in data.items() if k in allowed_headers}
+    return _write_changes(row_data, row_num, headers_to_update)
+
+_TRANSITIONS = {
+    "start": _start_transition,
+    "pause": _pause_transition,
+    "cancel": _cancel_transition,
+    "finish": _finish_transition,
+    "approve": _approve_transition,
+    "rework": _rework_transition,
+    "update": _update_transition,
+}
+
+def _run_transition(wo_id, action, data, if_match):
+    """Applies one transition; returns (status_code, body, etag) for the response."""
+    # Read, If-Match check and write as one step, or two requests holding the same
+    # ETag could both pass the check
+    with _SHEET_LOCKS[workorders_sheet.title]:
+        row_data, row_num = find_row(workorders_sheet, "WorkOrderID", wo_id)
+        if not row_data:
+            return 404, {"status": "error", "message": "Work order not found"}, None
+
+        etag = row_etag(row_data)
+        if if_match and not if_match.contains(etag):
+            # Changed since the client last saw it: send the whole current row instead of writing
+            return 412, {"status": "error", "message": "Work order has changed", "workorder": row_data}, etag
+
+        changes, error = _TRANSITIONS[action](row_data, row_num, data)
+    if error:
+        return error[0], {"status": "error", "message": error[1]}, None
+    # With If-Match the client provably holds the rest of the row, so only the changed
+    # fields go back; otherwise its copy may be stale and gets the whole row. The ETag
+    # covers the whole row either way.
+    return 200, {"status": "success", "workorder": changes if if_match else row_data}, row_etag(row_data)
+
+def _transition_response(wo_id, action):
+    status, body, etag = _run_transition(wo_id, action, request.get_json(silent=True) or {}, request.if_match)
+    response = jsonify(body)
+    response.status_code = status
+    if etag:
+        response.set_etag(etag)
+    return response
+
+@app.route('/workorder/<string:wo_id>/start', methods=['PUT'])
+def start_work_order(wo_id):
+    return _transition_response(wo_id, "start")
+
+@app.route('/workorder/<string:wo_id>/pause', methods=['PUT'])
+def pause_work_order(wo_id):
+    return _transition_response(wo_id, "pause")
 
 @app.route('/workorder/<string:wo_id>/cancel', methods=['PUT'])
 def cancel_work_order(wo_id):
-    row_data, row_num = find_row(workorders_sheet, "WorkOrderID", wo_id)
-    if not row_data:
-        return jsonify({"status": "error", "message": "Work order not found"}), 404
+    return _transition_response(wo_id, "cancel")
 
-    _log_time(row_data, row_num)
-    headers = {
-        "Status": "Cancelled",
-        "InProgressUserID": "",
-        "CurrentStartTime": "",
-        "QA_SubmittedByID": ""
-    }
-    update_cells(workorders_sheet, row_num, headers)
-    return jsonify({"status": "success"}), 200
+@app.route('/workorder/<string:wo_id>/finish', methods=['PUT'])
+def finish_work_order(wo_id):
+    return _transition_response(wo_id, "finish")
+
+@app.route('/workorder/<string:wo_id>/approve', methods=['PUT'])
+def approve_work_order(wo_id):
+    return _transition_response(wo_id, "approve")
+
+@app.route('/workorder/<string:wo_id>/rework', methods=['PUT'])
+def rework_work_order(wo_id):
+    return _transition_response(wo_id, "rework")
+
+@app.route('/workorders/batch', methods=['POST'])
+def batch_work_order_transitions():
+    """Applies several status transitions in one request.
+
+    Body: {"Transitions": [{"WorkOrderID", "Action", "Payload", "IfMatch"}, ...]}. Each
+    result carries the status code, body and ETag the matching PUT would have returned.
+    """
+    items = (request.get_json(silent=True) or {}).get("Transitions", [])
+    results = []
+    for item in items:
+        wo_id = str(item.get("WorkOrderID"))
+        action = item.get("Action")
+        if action not in _TRANSITIONS:
+            results.append({"WorkOrderID": wo_id, "StatusCode": 400, "Body": {"status": "error", "message": f"Unknown action: {action}"}, "ETag": None})
+            continue
+        try:
+            status, body, etag = _run_transition(wo_id, action, item.get("Payload") or {}, parse_etags(item.get("IfMatch")))
+        except Exception as e:
+            print(f"API ERROR (batch_work_order_transitions): {e}")
+            status, body, etag = 500, {"status": "error", "message": str(e)}, None
+        results.append({"WorkOrderID": wo_id, "StatusCode": status, "Body": body, "ETag": quote_etag(etag) if etag else None})
+
+    return jsonify({"status": "success", "results": results}), 200
 
 # --- MAIN ---
 if __name__ == '__main__':
+    from waitress import serve
     print("Database API is running on http://127.0.0.1:5000")
-    app.run(port=5000, debug=True)
\ No newline at end of file
+    serve(app, host='127.0.0.1', port=5000, threads=8)
\ No newline at end of file
@@ -1,10 +1,15 @@
 import discord
 from discord import app_commands, ui, Interaction
-from discord.utils import get
-import requests
 import datetime
 import asyncio
 
+from shared.api_client import close_session, get_api, get_session
+
+try:
+    import uvloop  # Optional: faster event loop (Linux/macOS)
+except ImportError:
+    uvloop = None
+
 # --- Import secrets ---
 try:
     from config import (
@@ -12,6 +17,7 @@ try:
         GUILD_ID, 
         PLANNING_CHANNEL_ID,
         ACTIVE_CATEGORY_ID,
+        FINISHED_CATEGORY_ID,
         API_BASE_URL
     )
 except ImportError:
@@ -27,6 +33,7 @@ intents = discord.Intents.default()
 intents.members = True # For user dropdowns
 client = discord.Client(intents=intents)
 tree = app_commands.CommandTree(client)
+api = get_api(API_BASE_URL)
 
 # --- ================================== ---
 # --- PLANNING DASHBOARD & BUTTONS
@@ -52,8 +59,9 @@ class PlanningDashboardView(ui.View):
 
         # 2. Open the Project Creation Modal
         modal = ProjectCreateModal(
-            api_url=API_BASE_URL,
+            api=api,
             active_category_id=ACTIVE_CATEGORY_ID,
+            finished_category_id=FINISHED_CATEGORY_ID,
             sheet_url=sheet_url
         )
         await interaction.response.send_modal(modal)
@@ -62,6 +70,9 @@ class PlanningDashboardView(ui.View):
 # --- BOT COMMANDS & EVENTS
 # --- ================================== ---
 
+# ID of the current sticky dashboard message, so it can be replaced without a history scan
+sticky_message_id = None
+
 @tree.command(
     name="setup-planning-dashboard", 
     description="[Admin] Posts the main planning dashboard.",
@@ -93,8 +104,10 @@ async def setup_dashboard(interaction: Interaction):
     )
     embed.add_field(name="Project G-Sheet Link", value=f"[Open Sheet]({sheet_url})", inline=False)
     
+    global sticky_message_id
     view = PlanningDashboardView()
-    await interaction.channel.send(embed=embed, view=view)
+    sticky = await interaction.channel.send(embed=embed, view=view)
+    sticky_message_id = sticky.id
     await interaction.delete_original_response() # Delete the "..." message
 
 
@@ -109,12 +122,16 @@ async def on_message(message: discord.Message):
     # Wait a sec for the user's message to send
     await asyncio.sleep(1)
     
-    # 1. Find the bot's last message
+    # 1. Find the bot's last message (cached after the first post)
+    global sticky_message_id
     last_bot_message = None
-    async for msg in message.channel.history(limit=10):
-        if msg.author == client.user:
-            last_bot_message = msg
-            break
+    if sticky_message_id:
+        last_bot_message = message.channel.get_partial_message(sticky_message_id)
+    else:
+        async for msg in message.channel.history(limit=10):
+            if msg.author == client.user:
+                last_bot_message = msg
+                break
             
     # 2. If it exists, delete it
     if last_bot_message:
@@ -140,11 +157,14 @@ async def on_message(message: discord.Message):
     embed.add_field(name="Project G-Sheet Link", value=f"[Open Sheet]({sheet_url})", inline=False)
     
     view = PlanningDashboardView()
-    await message.channel.send(embed=embed, view=view)
+    sticky = await message.channel.send(embed=embed, view=view)
+    sticky_message_id = sticky.id
 
 
 @client.event
 async def on_ready():
+    get_session() # Open the shared HTTP session on the bot's event loop
+
     # Register the persistent view
     client.add_view(PlanningDashboardView())
     
@@ -156,4 +176,12 @@ async def on_ready():
     if channel:
         await on_message(await channel.fetch_message(channel.last_message_id))
 
-client.run(PLANNING_BOT_TOKEN)
\ No newline at end of file
+async def main():
+    async with client:
+        try:
+            await client.start(PLANNING_BOT_TOKEN)
+        finally:
+            await close_session()
+
+discord.utils.setup_logging() # client.run() used to do this for us
+(uvloop.run if uvloop else asyncio.run)(main())
\ No newline at end of file
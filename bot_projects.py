@@ -1,12 +1,15 @@
 import discord
-from discord import app_commands, ui, Interaction
-from discord.utils import get
-import requests
+from discord import app_commands
 import datetime
 import asyncio
 from discord.ext import tasks
 
-from shared.thread_titles import format_thread_title
+from shared.api_client import close_session, get_api, get_session
+
+try:
+    import uvloop  # Optional: faster event loop (Linux/macOS)
+except ImportError:
+    uvloop = None
 
 # --- Import secrets ---
 try:
@@ -25,9 +28,7 @@ except ImportError:
 # --- Import UI ---
 from bot_ui import (
     ProjectControlView,
-    WorkOrderCreateModal,
-    ProjectEditModal,
-    WorkOrderControlView
+    register_work_order_buttons
 )
 
 # --- BOT SETUP ---
@@ -36,109 +37,14 @@ intents.members = True # For user lookups
 intents.message_content = True # For sticky messages
 client = discord.Client(intents=intents)
 tree = app_commands.CommandTree(client)
+api = get_api(API_BASE_URL)
 
 # --- ================================== ---
-# --- HELPER FUNCTIONS
-# --- ================================== ---
-
-def get_project_id_from_channel(channel: discord.TextChannel) -> str:
-    """Extracts the ProjectID from a channel's topic."""
-    if not channel.topic or not channel.topic.startswith("ProjectID:"):
-        return None
-    return channel.topic.split("ProjectID:")[1].strip()
-
-def get_wo_id_from_thread(thread: discord.Thread) -> str:
-    """Extracts the WorkOrderID from a thread's topic."""
-    if not thread.topic or not thread.topic.startswith("WorkOrderID:"):
-        return None
-    return thread.topic.split("WorkOrderID:")[1].strip()
-
-
-project_lookup = {}
-
-
-def get_project_data(project_id: str) -> dict:
-    """Fetches project data from cache or API and updates the shared lookup."""
-    if not project_id:
-        return {}
-
-    project_id = str(project_id)
-
-    project_data = project_lookup.get(project_id)
-    if project_data:
-        return project_data
-
-    try:
-        response = requests.get(f"{API_BASE_URL}/project/{project_id}")
-        if response.status_code == 200:
-            project_data = response.json().get("project", {})
-            if project_data:
-                project_lookup[project_id] = project_data
-                return project_data
-    except Exception as e:
-        print(f"PROJECT LOOKUP ERROR: Could not fetch project {project_id}: {e}")
-
-    return {}
-
-# --- ================================== ---
-# --- TIMER & SCHEDULER LOOP
+# --- SCHEDULER LOOP
 # --- ================================== ---
 
-@tasks.loop(seconds=60)
-async def timer_loop():
-    """Updates all active work order timers every minute."""
-    await client.wait_until_ready()
-    
-    try:
-        response = requests.get(f"{API_BASE_URL}/workorders/inprogress")
-        response.raise_for_status()
-        active_wos = response.json().get("workorders", [])
-    except Exception as e:
-        print(f"TIMER LOOP ERROR: Could not fetch active WOs: {e}")
-        return
-
-    guild = client.get_guild(GUILD_ID)
-    if not guild:
-        return
-
-    project_cache = {}
-
-    for wo_data in active_wos:
-        try:
-            thread_id = int(wo_data.get("ThreadID"))
-            thread = guild.get_thread(thread_id)
-            if not thread:
-                print(f"TIMER LOOP: Thread {thread_id} not found, skipping.")
-                continue
-            
-            # 1. Find the sticky message
-            async for msg in thread.history(limit=5):
-                if msg.author == client.user and msg.embeds and "Work Order:" in msg.embeds[0].title:
-                    # 2. Get updated WO data (to refresh timer)
-                    wo_id = wo_data.get("WorkOrderID")
-                    response = requests.get(f"{API_BASE_URL}/workorder/{wo_id}")
-                    if response.status_code != 200:
-                        continue # Skip this one
-                    
-                    updated_wo_data = response.json().get("workorder", {})
-
-                    project_id = updated_wo_data.get("ProjectID")
-                    if project_id:
-                        project_id = str(project_id)
-                    if not project_id and thread.parent:
-                        project_id = get_project_id_from_channel(thread.parent)
-                    project_data = get_project_data(project_id)
-
-                    # 3. Re-build embed and view
-                    embed = WorkOrderControlView.build_embed(updated_wo_data)
-                    view = WorkOrderControlView(api_url=API_BASE_URL, project_data=project_data, wo_data=updated_wo_data)
-
-                    # 4. Edit the message
-                    await msg.edit(embed=embed, view=view)
-                    break # Move to next WO
-
-        except Exception as e:
-            print(f"TIMER LOOP ERROR: Failed to update timer for WO {wo_data.get('WorkOrderID')}: {e}")
+# Max number of project channels renamed at the same time
+TITLE_EDIT_CONCURRENCY = 5
 
 @tasks.loop(hours=24)
 async def update_project_titles_loop():
@@ -147,7 +53,7 @@ async def update_project_titles_loop():
     print("SCHEDULER: Running daily project title update...")
     
     try:
-        response = requests.get(f"{API_BASE_URL}/projects/active")
+        response = await api.get("/projects/active")
         response.raise_for_status()
         active_projects = response.json().get("projects", [])
     except Exception as e:
@@ -159,21 +65,26 @@ async def update_project_titles_loop():
         return
 
     today = datetime.date.today()
-    for proj in active_projects:
-        try:
-            channel = guild.get_channel(int(proj.get("ChannelID")))
-            if not channel:
-                continue
-                
-            due_date = datetime.datetime.strptime(proj.get("DueDate"), '%Y-%m-%d').date()
-            days_left = (due_date - today).days
-            new_title = f"({days_left}d) {proj.get('Title')}"
-            
-            if channel.name != new_title:
-                await channel.edit(name=new_title)
+    semaphore = asyncio.Semaphore(TITLE_EDIT_CONCURRENCY)
+
+    async def update_title(proj: dict):
+        async with semaphore:
+            try:
+                channel = guild.get_channel(int(proj.get("ChannelID")))
+                if not channel:
+                    return
+                    
+                due_date = datetime.date.fromisoformat(str(proj.get("DueDate")))
+                days_left = (due_date - today).days
+                new_title = f"({days_left}d) {proj.get('Title')}"
                 
-        except Exception as e:
-            print(f"SCHEDULER ERROR: Failed to update title for {proj.get('Title')}: {e}")
+                if channel.name != new_title:
+                    await channel.edit(name=new_title)
+                    
+            except Exception as e:
+                print(f"SCHEDULER ERROR: Failed to update title for {proj.get('Title')}: {e}")
+
+    await asyncio.gather(*(update_title(proj) for proj in active_projects), return_exceptions=True)
     
     print("SCHEDULER: Daily project title update complete.")
 
@@ -181,56 +92,50 @@ async def update_project_titles_loop():
 # --- BOT EVENTS
 # --- ================================== ---
 
+# on_ready fires again after every reconnect; the setup below only runs once
+startup_done = False
+
 @client.event
 async def on_ready():
     await client.wait_until_ready()
+    global startup_done
+    if startup_done:
+        print(f'Reconnected as {client.user} (Projects Bot)')
+        return
+    startup_done = True
+    get_session() # Open the shared HTTP session on the bot's event loop
 
-    # Load active projects so each persistent view is registered with its ProjectID
-    global project_lookup
-    project_lookup = {}
+    # Register a persistent view with its ProjectID for each active project
     try:
-        response = requests.get(f"{API_BASE_URL}/projects/active")
+        response = await api.get("/projects/active")
         response.raise_for_status()
         active_projects = response.json().get("projects", [])
     except Exception as e:
-        print(f"ON_READY ERROR: Could not load active projects: {e}")
+        print(f"ON_READY ERROR: Could not load projects: {e}")
         active_projects = []
 
     for project in active_projects:
-        project_id = str(project.get("ProjectID")) if project.get("ProjectID") else None
-        if not project_id:
-            continue
-        project_lookup[project_id] = project
-        client.add_view(ProjectControlView(api_url=API_BASE_URL, project_data=project))
-
-    # Load actionable work orders so their persistent views have the proper IDs
-    try:
-        response = requests.get(f"{API_BASE_URL}/workorders/active")
-        response.raise_for_status()
-        active_workorders = response.json().get("workorders", [])
-    except Exception as e:
-        print(f"ON_READY ERROR: Could not load active work orders: {e}")
-        active_workorders = []
-
-    for wo in active_workorders:
-        wo_id = wo.get("WorkOrderID")
-        if not wo_id:
-            continue
+        if project.get("ProjectID"):
+            client.add_view(ProjectControlView(api=api, project_data=project, finished_category_id=FINISHED_CATEGORY_ID))
 
-        project_id = str(wo.get("ProjectID")) if wo.get("ProjectID") else None
-        project_data = get_project_data(project_id)
-        if not project_data and project_id:
-            print(f"ON_READY WARNING: Project data missing for WO {wo_id} (ProjectID: {project_id}).")
-
-        client.add_view(WorkOrderControlView(api_url=API_BASE_URL, project_data=project_data, wo_data=wo))
+    # Work order buttons carry their WorkOrderID and are resolved on click
+    register_work_order_buttons(client, api)
 
     await tree.sync(guild=discord.Object(id=GUILD_ID))
 
-    # Start background loops
-    timer_loop.start()
-    update_project_titles_loop.start()
+    # Start background loop
+    if not update_project_titles_loop.is_running():
+        update_project_titles_loop.start()
     
     print(f'Logged in as {client.user} (Projects Bot)')
-    print('Bot is running and loops have started.')
+    print('Bot is running and the scheduler has started.')
+
+async def main():
+    async with client:
+        try:
+            await client.start(PROJECTS_BOT_TOKEN)
+        finally:
+            await close_session()
 
-client.run(PROJECTS_BOT_TOKEN)
\ No newline at end of file
+discord.utils.setup_logging() # client.run() used to do this for us
+(uvloop.run if uvloop else asyncio.run)(main())
\ No newline at end of file
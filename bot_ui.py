@@ -1,23 +1,170 @@
 import discord
 from discord import app_commands, ui, Interaction
-from discord.utils import get
-import requests
+import asyncio
 import datetime
+import functools
+import time
 from typing import Optional
 
-from shared.thread_titles import format_thread_title
+from shared.api_client import ApiClient, TRANSPORT_ERRORS, cache_put, etag_for
+from shared.thread_titles import NAME_MAX_LENGTH, TITLE_MAX_LENGTH, format_thread_title
+
+# --- ================================== ---
+# --- SHARED HELPERS
+# --- ================================== ---
+
+# What a handler can expect to go wrong: the API is unreachable or a Discord call fails.
+# API error statuses are checked explicitly on the response.
+_REQUEST_ERRORS = (*TRANSPORT_ERRORS, discord.HTTPException)
+
+
+async def _rename_channel(channel, name: str):
+    """Renames a channel/thread, skipping the call (and its rate limit) when the name is unchanged."""
+    name = name[:NAME_MAX_LENGTH]
+    if channel.name != name:
+        await channel.edit(name=name)
+
+# Background tasks are referenced here until they finish so they aren't garbage collected
+_background_tasks = set()
+
+def _spawn(coro, description: str) -> asyncio.Task:
+    """Runs a coroutine off the interaction's critical path, logging (not losing) its errors."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+
+    def _done(t: asyncio.Task):
+        _background_tasks.discard(t)
+        if not t.cancelled() and t.exception():
+            print(f"UI WARNING: Background {description} failed: {t.exception()}")
+
+    task.add_done_callback(_done)
+    return task
+
+# Channel/thread names are heavily rate-limited (2 edits per 10 minutes), so renames wait
+# out a short window, and at least RENAME_MIN_INTERVAL_SECONDS after the previous rename of
+# the same channel; only the latest requested name is written. Waiting here is cheaper
+# than letting discord.py sit out a 429 for minutes.
+RENAME_DEBOUNCE_SECONDS = 2.0
+RENAME_MIN_INTERVAL_SECONDS = 300
+_pending_renames = {} # channel_id -> latest requested name
+_rename_tasks = {} # channel_id -> task waiting to write it
+_last_renamed = {} # channel_id -> time.monotonic() of the last rename still within its interval
+
+def _schedule_rename(channel, name: str):
+    """Queues a rename in the background; rapid status changes collapse into one edit."""
+    name = name[:NAME_MAX_LENGTH] # Project names aren't pre-clipped
+    if channel.id not in _pending_renames and channel.name == name:
+        return # Title unchanged (e.g. an edit that kept the title); nothing to schedule
+    _pending_renames[channel.id] = name
+    task = _rename_tasks.get(channel.id)
+    if task is None or task.done():
+        _rename_tasks[channel.id] = _spawn(_flush_rename(channel), "channel rename")
+
+def _prune_last_renamed(now: float):
+    """Forgets channels whose rename interval has passed; they can be renamed right away."""
+    for channel_id in [cid for cid, at in _last_renamed.items() if now - at >= RENAME_MIN_INTERVAL_SECONDS]:
+        del _last_renamed[channel_id]
+
+async def _flush_rename(channel):
+    try:
+        last = _last_renamed.get(channel.id)
+        wait = 0 if last is None else last + RENAME_MIN_INTERVAL_SECONDS - time.monotonic()
+        await asyncio.sleep(max(RENAME_DEBOUNCE_SECONDS, wait))
+    finally:
+        _rename_tasks.pop(channel.id, None)
+        name = _pending_renames.pop(channel.id, None)
+    now = time.monotonic()
+    _prune_last_renamed(now)
+    if name is None or channel.name == name:
+        return
+    _last_renamed[channel.id] = now
+    await _rename_channel(channel, name)
+
+async def _gather_logged(*coros, description: str):
+    """Runs independent Discord calls together; one failing (e.g. rate-limited) doesn't sink the rest."""
+    for result in await asyncio.gather(*coros, return_exceptions=True):
+        if isinstance(result, Exception):
+            print(f"UI WARNING: {description} failed: {result}")
+
+# WorkOrderIDs with an action in flight; a second click on the same one is turned away
+# instead of racing the first (views are per click, so this can't live on the view)
+_BUSY_WORK_ORDERS = set()
+BUSY_MESSAGE = "Still processing the previous action on this work order, please wait."
+
+# Handlers that answer with response.edit_message get this long (from the click) before
+# falling back to a defer; Discord drops interactions not acknowledged within 3 seconds.
+ACK_DEADLINE_SECONDS = 2.0
+
+# Longest work order title/deliverables the modals accept (Discord checks them before
+# submitting); deliverables stay within an embed field's 1024 characters
+WORK_ORDER_TITLE_MAX_LENGTH = 200
+WORK_ORDER_DELIVERABLES_MAX_LENGTH = 1024
+
+async def _await_or_defer(interaction: Interaction, coro, **defer_kwargs):
+    """Awaits coro, deferring the interaction first if it would outlast ACK_DEADLINE_SECONDS."""
+    task = asyncio.ensure_future(coro)
+    if not interaction.response.is_done():
+        elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(ACK_DEADLINE_SECONDS - elapsed, 0))
+        except asyncio.TimeoutError:
+            await interaction.response.defer(**defer_kwargs)
+    return await task
+
+async def _defer(interaction: Interaction, **kwargs):
+    """Acknowledges the interaction unless that already happened."""
+    if not interaction.response.is_done():
+        await interaction.response.defer(**kwargs)
+
+async def _send_ephemeral(interaction: Interaction, content: str, **kwargs):
+    """Sends an ephemeral reply whether or not the interaction has been acknowledged yet."""
+    if interaction.response.is_done():
+        await interaction.followup.send(content, ephemeral=True, **kwargs)
+    else:
+        await interaction.response.send_message(content, ephemeral=True, **kwargs)
+
+# Shared overwrite objects; discord.py only reads them, so every channel can reuse them
+_DENY_READ = discord.PermissionOverwrite(read_messages=False)
+_BOT_PERMS = discord.PermissionOverwrite(read_messages=True, manage_messages=True, manage_threads=True)
+_ACCOUNTABLE_PERMS = discord.PermissionOverwrite(read_messages=True, manage_messages=True)
+
+# (guild_id, category_id) -> permission overwrites every project channel starts from
+_OVERWRITE_TEMPLATES = {}
+
+def _baseline_overwrites(guild: discord.Guild, category: discord.CategoryChannel) -> dict:
+    """Returns the cached private-channel baseline (hidden from @everyone, bot can manage)."""
+    key = (guild.id, category.id)
+    template = _OVERWRITE_TEMPLATES.get(key)
+    if template is None:
+        template = {
+            guild.default_role: _DENY_READ,
+            guild.me: _BOT_PERMS
+        }
+        _OVERWRITE_TEMPLATES[key] = template
+    return template
+
+def _category_has_baseline(category: discord.CategoryChannel, baseline: dict) -> bool:
+    """True if the category's own overwrites already grant/deny everything in the baseline.
+
+    Checked on every create (an in-memory lookup) since admins can change the category at any time.
+    """
+    for target, required in baseline.items():
+        current = category.overwrites_for(target)
+        if any(getattr(current, perm) != value for perm, value in required if value is not None):
+            return False
+    return True
 
-from bot_projects import format_thread_title
 
 # --- ================================== ---
 # --- 1. PLANNING BOT UI
 # --- ================================== ---
 
 class ProjectCreateModal(ui.Modal, title='Create New Project'):
-    def __init__(self, api_url: str, active_category_id: int, sheet_url: str):
+    def __init__(self, api: ApiClient, active_category_id: int, finished_category_id: int, sheet_url: str):
         super().__init__(timeout=600)
-        self.API_BASE_URL = api_url
+        self.api = api
         self.ACTIVE_CATEGORY_ID = active_category_id
+        self.FINISHED_CATEGORY_ID = finished_category_id
         self.SHEET_URL = sheet_url
 
         # Ensure dynamic defaults each time the modal is opened
@@ -66,7 +213,7 @@ class ProjectCreateModal(ui.Modal, title='Create New Project'):
         
         # 2. Create Discord Channel
         guild = interaction.guild
-        category = get(guild.categories, id=self.ACTIVE_CATEGORY_ID)
+        category = guild.get_channel(self.ACTIVE_CATEGORY_ID) # O(1) lookup in the guild's channel map
         if not category:
             await interaction.followup.send(f"Error: 'Active' category not found.", ephemeral=True)
             return
@@ -75,19 +222,27 @@ class ProjectCreateModal(ui.Modal, title='Create New Project'):
         days_left = (due_date - datetime.date.today()).days
         channel_title = f"({days_left}d) {self.title_input.value}"
         
-        overwrites = {
-            guild.default_role: discord.PermissionOverwrite(read_messages=False),
-            accountable_user: discord.PermissionOverwrite(read_messages=True, manage_messages=True),
-            guild.me: discord.PermissionOverwrite(read_messages=True, manage_messages=True, manage_threads=True)
-        }
-        
+        # If the category already carries the baseline, let the channel inherit it and only
+        # add the accountable person afterwards (more reliable on fresh private channels);
+        # otherwise the channel gets the @everyone deny itself
+        baseline = _baseline_overwrites(guild, category)
+        inherits = _category_has_baseline(category, baseline)
+
+        new_channel = None
         try:
-            new_channel = await guild.create_text_channel(
-                channel_title,
-                category=category,
-                overwrites=overwrites
-            )
+            if inherits:
+                new_channel = await guild.create_text_channel(channel_title, category=category)
+                await asyncio.sleep(0.5)
+                await new_channel.set_permissions(accountable_user, overwrite=_ACCOUNTABLE_PERMS)
+            else:
+                new_channel = await guild.create_text_channel(
+                    channel_title,
+                    category=category,
+                    overwrites={**baseline, accountable_user: _ACCOUNTABLE_PERMS}
+                )
         except Exception as e:
+            if new_channel:
+                await new_channel.delete(reason="Could not set channel permissions")
             await interaction.followup.send(f"Error creating Discord channel: {e}", ephemeral=True)
             return
 
@@ -102,42 +257,65 @@ class ProjectCreateModal(ui.Modal, title='Create New Project'):
         }
         
         try:
-            response = requests.post(f"{self.API_BASE_URL}/project", json=payload)
-            response.raise_for_status()
-            project_data = response.json().get("project", {})
-            project_id = project_data.get("ProjectID")
-        except Exception as e:
-            await new_channel.delete(reason="API call failed")
-            await interaction.followup.send(f"Error creating project in API: {e}", ephemeral=True)
+            response = await self.api.post("/project", json=payload)
+            error = None if response.ok else response.error_message
+        except TRANSPORT_ERRORS as e:
+            error = e
+        if not error:
+            # A 2xx with an unexpected body still leaves nothing to attach the channel to
+            body = response.json()
+            project_data = body.get("project") if isinstance(body, dict) else None
+            if not project_data:
+                error = "API returned no project data"
+        if error:
+            _spawn(new_channel.delete(reason="API call failed"), "rollback delete") # Tell the user without waiting on cleanup
+            await interaction.followup.send(f"Error creating project in API: {error}", ephemeral=True)
             return
+        project_id = project_data.get("ProjectID")
+        cache_put("project", project_id, project_data)
 
-        # 4. Set Channel Topic
-        try:
-            await new_channel.edit(topic=f"ProjectID: {project_id}")
-        except Exception as e:
-            print(f"UI WARNING: Could not set topic for channel {new_channel.id}: {e}")
-
-        # 5. Post the sticky message in the new channel
+        # 4. Set Channel Topic and post the sticky message in the new channel (independent, so together)
         embed = ProjectControlView.build_embed(project_data)
-        view = ProjectControlView(api_url=self.API_BASE_URL, project_data=project_data)
-        message = await new_channel.send(embed=embed, view=view)
-        try:
-            await message.pin()
-        except discord.HTTPException as e:
-            print(f"UI WARNING: Could not pin project control message in {new_channel.id}: {e}")
+        view = ProjectControlView(api=self.api, project_data=project_data, finished_category_id=self.FINISHED_CATEGORY_ID)
+        topic_result, message = await asyncio.gather(
+            new_channel.edit(topic=f"ProjectID: {project_id}"),
+            new_channel.send(embed=embed, view=view),
+            return_exceptions=True
+        )
+        if isinstance(topic_result, Exception):
+            print(f"UI WARNING: Could not set topic for channel {new_channel.id}: {topic_result}")
+        if isinstance(message, Exception):
+            # The project exists in the API by now, so keep the channel and say what's missing
+            print(f"UI ERROR: Could not post the control message in channel {new_channel.id}: {message}")
+            await interaction.followup.send(
+                f"Project channel created: {new_channel.mention}, but its control message could not be posted: {message}",
+                ephemeral=True
+            )
+            return
 
-        await interaction.followup.send(f"Success! Project channel created: {new_channel.mention}", ephemeral=True)
+        # 5. Pin the sticky message and confirm (independent, so together)
+        await _gather_logged(
+            message.pin(),
+            interaction.followup.send(f"Success! Project channel created: {new_channel.mention}", ephemeral=True),
+            description=f"Project setup in channel {new_channel.id}"
+        )
 
 
 # --- ================================== ---
 # --- 2. PROJECTS BOT UI
 # --- ================================== ---
 
+# Project fields shown on the sticky embed
+_PROJECT_RENDER_FIELDS = ("ProjectID", "Title", "Deliverables", "KPI", "AccountableID", "DueDate", "DriveFolderURL")
+PROJECT_EMBED_CACHE_SIZE = 256
+_PROJECT_EMBED_CACHE = {} # _PROJECT_RENDER_FIELDS values -> rendered embed dict
+
 class ProjectControlView(ui.View):
     """Persistent view for the sticky message in a Project Channel."""
-    def __init__(self, api_url: str, project_data: dict):
+    def __init__(self, api: ApiClient, project_data: dict, finished_category_id: int):
         super().__init__(timeout=None)
-        self.API_BASE_URL = api_url
+        self.api = api
+        self.FINISHED_CATEGORY_ID = finished_category_id
         
         # Add the ProjectID to the buttons
         project_id = project_data.get("ProjectID")
@@ -148,7 +326,19 @@ class ProjectControlView(ui.View):
 
     @staticmethod
     def build_embed(project_data: dict) -> discord.Embed:
-        """Helper to build the sticky project embed."""
+        """Helper to build the sticky project embed (memoized on the displayed fields)."""
+        key = tuple(project_data.get(field) for field in _PROJECT_RENDER_FIELDS)
+        cached = _PROJECT_EMBED_CACHE.get(key)
+        if cached is None:
+            cached = ProjectControlView._render_embed(project_data).to_dict()
+            if len(_PROJECT_EMBED_CACHE) >= PROJECT_EMBED_CACHE_SIZE:
+                _PROJECT_EMBED_CACHE.pop(next(iter(_PROJECT_EMBED_CACHE)))
+            _PROJECT_EMBED_CACHE[key] = cached
+        # Hand out a fresh copy so callers can't mutate the cached one
+        return discord.Embed.from_dict(cached)
+
+    @staticmethod
+    def _render_embed(project_data: dict) -> discord.Embed:
         embed = discord.Embed(
             title=f"🚀 Project: {project_data.get('Title', 'N/A')}",
             color=discord.Color.blue()
@@ -171,14 +361,12 @@ class ProjectControlView(ui.View):
         project_id = interaction.data["custom_id"].split(":")[-1]
         
         # Fetch project data to pass AccountableID
-        response = requests.get(f"{self.API_BASE_URL}/project/{project_id}")
-        if response.status_code != 200:
+        project_data = await self.api.fetch_project(project_id)
+        if project_data is None:
             await interaction.response.send_message("Error: Could not find project data.", ephemeral=True)
             return
 
-        project_data = response.json().get("project", {})
-
-        prompt_view = WorkOrderCreatePromptView(api_url=self.API_BASE_URL, project_data=project_data)
+        prompt_view = WorkOrderCreatePromptView(api=self.api, project_data=project_data)
         await interaction.response.send_message(
             "Who should this work order be pushed to?",
             ephemeral=True,
@@ -190,19 +378,18 @@ class ProjectControlView(ui.View):
         project_id = interaction.data["custom_id"].split(":")[-1]
         
         # Only the accountable person can edit
-        response = requests.get(f"{self.API_BASE_URL}/project/{project_id}")
-        if response.status_code != 200:
+        project_data = await self.api.fetch_project(project_id)
+        if project_data is None:
             await interaction.response.send_message("Error: Could not find project data.", ephemeral=True)
             return
             
-        project_data = response.json().get("project", {})
         accountable_id = str(project_data.get("AccountableID"))
         
         if str(interaction.user.id) != accountable_id:
             await interaction.response.send_message(f"Only the accountable person (<@{accountable_id}>) can edit this project.", ephemeral=True)
             return
             
-        modal = ProjectEditModal(api_url=self.API_BASE_URL, project_data=project_data)
+        modal = ProjectEditModal(api=self.api, project_data=project_data)
         await interaction.response.send_modal(modal)
 
     @ui.button(label="Finish Project", style=discord.ButtonStyle.red, custom_id="proj_finish_base")
@@ -210,12 +397,11 @@ class ProjectControlView(ui.View):
         project_id = interaction.data["custom_id"].split(":")[-1]
 
         # Only the accountable person can finish
-        response = requests.get(f"{self.API_BASE_URL}/project/{project_id}")
-        if response.status_code != 200:
+        project_data = await self.api.fetch_project(project_id)
+        if project_data is None:
             await interaction.response.send_message("Error: Could not find project data.", ephemeral=True)
             return
             
-        project_data = response.json().get("project", {})
         accountable_id = str(project_data.get("AccountableID"))
         
         if str(interaction.user.id) != accountable_id:
@@ -243,11 +429,13 @@ class ProjectControlView(ui.View):
         original_message: discord.Message
     ) -> bool:
         try:
-            response = requests.put(f"{self.API_BASE_URL}/project/{project_id}/finish")
-            response.raise_for_status()
+            response = await self.api.put(f"/project/{project_id}/finish")
+            if not response.ok:
+                await interaction.followup.send(f"An error occurred while finishing the project: {response.error_message}", ephemeral=True)
+                return False
+            cache_put("project", project_id, response.json().get("project"))
 
-            from config import FINISHED_CATEGORY_ID
-            category = get(original_message.guild.categories, id=FINISHED_CATEGORY_ID)
+            category = original_message.guild.get_channel(self.FINISHED_CATEGORY_ID)
             if category:
                 finish_date = datetime.date.today().isoformat()
                 await original_message.channel.edit(
@@ -262,7 +450,7 @@ class ProjectControlView(ui.View):
 
             await original_message.channel.send("Project has been marked as Finished and archived!")
             return True
-        except Exception as e:
+        except _REQUEST_ERRORS as e:
             await interaction.followup.send(f"An error occurred while finishing the project: {e}", ephemeral=True)
             return False
 
@@ -303,9 +491,9 @@ class ProjectFinishConfirmView(ui.View):
         self.stop()
 
 class ProjectEditModal(ui.Modal, title='Edit Project Details'):
-    def __init__(self, api_url: str, project_data: dict):
+    def __init__(self, api: ApiClient, project_data: dict):
         super().__init__(timeout=600)
-        self.API_BASE_URL = api_url
+        self.api = api
         self.project_id = project_data.get("ProjectID")
         self.project_data = project_data
         
@@ -345,9 +533,12 @@ class ProjectEditModal(ui.Modal, title='Edit Project Details'):
         }
         
         try:
-            response = requests.put(f"{self.API_BASE_URL}/project/{self.project_id}", json=payload)
-            response.raise_for_status()
+            response = await self.api.put(f"/project/{self.project_id}", json=payload)
+            if not response.ok:
+                await interaction.followup.send(f"Error updating project: {response.error_message}", ephemeral=True)
+                return
             new_data = response.json().get("project")
+            cache_put("project", self.project_id, new_data)
             
             # Edit the sticky message
             embed = ProjectControlView.build_embed(new_data)
@@ -356,10 +547,10 @@ class ProjectEditModal(ui.Modal, title='Edit Project Details'):
             # Edit the channel title
             due_date = datetime.datetime.strptime(new_data.get("DueDate"), '%Y-%m-%d').date()
             days_left = (due_date - datetime.date.today()).days
-            await interaction.channel.edit(name=f"({days_left}d) {new_data.get('Title')}")
+            _schedule_rename(interaction.channel, f"({days_left}d) {new_data.get('Title')}")
             
             await interaction.followup.send("Project details updated!", ephemeral=True)
-        except Exception as e:
+        except (*_REQUEST_ERRORS, ValueError) as e:
             await interaction.followup.send(f"Error updating project: {e}", ephemeral=True)
 
 
@@ -376,9 +567,9 @@ class _WorkOrderPushUserSelect(ui.UserSelect):
 
 
 class WorkOrderCreatePromptView(ui.View):
-    def __init__(self, api_url: str, project_data: dict):
+    def __init__(self, api: ApiClient, project_data: dict):
         super().__init__(timeout=120)
-        self.API_BASE_URL = api_url
+        self.api = api
         self.project_data = project_data
         self.selected_user_id: Optional[str] = None
 
@@ -387,7 +578,7 @@ class WorkOrderCreatePromptView(ui.View):
 
     async def _open_modal(self, interaction: Interaction, user_id: Optional[str]):
         modal = WorkOrderCreateModal(
-            api_url=self.API_BASE_URL,
+            api=self.api,
             project_data=self.project_data,
             pushed_to_user_id=user_id
         )
@@ -420,9 +611,8 @@ class WorkOrderEditPromptView(ui.View):
 
     async def _open_modal(self, interaction: Interaction, user_id: Optional[str], update_push: bool):
         modal = WorkOrderEditModal(
-            api_url=self.control_view.API_BASE_URL,
+            api=self.control_view.api,
             wo_data=self.control_view.wo_data,
-            project_data=self.control_view.project_data,
             control_view=self.control_view,
             original_message=self.original_message,
             pushed_to_user_id=user_id,
@@ -449,20 +639,22 @@ class WorkOrderEditPromptView(ui.View):
         await self._open_modal(interaction, self.selected_user_id or "", update_push=True)
 
 class WorkOrderCreateModal(ui.Modal, title='Create New Work Order'):
-    def __init__(self, api_url: str, project_data: dict, pushed_to_user_id: Optional[str] = None):
+    def __init__(self, api: ApiClient, project_data: dict, pushed_to_user_id: Optional[str] = None):
         super().__init__(timeout=600)
-        self.API_BASE_URL = api_url
+        self.api = api
         self.project_data = project_data
         self.pushed_to_user_id = pushed_to_user_id or ""
 
     title_input = ui.TextInput(
         label="Work Order Title",
-        placeholder="e.g., 3D Print Grip v3.1"
+        placeholder="e.g., 3D Print Grip v3.1",
+        max_length=WORK_ORDER_TITLE_MAX_LENGTH
     )
     deliverables_input = ui.TextInput(
         label="Deliverables & Why",
         style=discord.TextStyle.paragraph,
-        placeholder="e.g., 1x 3D print in PETG, because we need to test the new ergonomics."
+        placeholder="e.g., 1x 3D print in PETG, because we need to test the new ergonomics.",
+        max_length=WORK_ORDER_DELIVERABLES_MAX_LENGTH
     )
 
     async def on_submit(self, interaction: Interaction):
@@ -472,7 +664,7 @@ class WorkOrderCreateModal(ui.Modal, title='Create New Work Order'):
 
         # 1. Create the Thread
         try:
-            thread_title = f"({self.title_input.value})" # Initial title, no time
+            thread_title = f"({self.title_input.value[:TITLE_MAX_LENGTH]})" # Initial title, no time
             thread = await interaction.channel.create_thread(
                 name=thread_title,
                 type=discord.ChannelType.public_thread
@@ -491,94 +683,189 @@ class WorkOrderCreateModal(ui.Modal, title='Create New Work Order'):
         }
         
         try:
-            response = requests.post(f"{self.API_BASE_URL}/workorder", json=payload)
-            response.raise_for_status()
-            wo_data = response.json().get("workorder", {})
-            wo_id = wo_data.get("WorkOrderID")
-        except Exception as e:
-            await thread.delete(reason="API call failed")
-            await interaction.followup.send(f"Error creating work order in API: {e}", ephemeral=True)
+            response = await self.api.post("/workorder", json=payload)
+            error = None if response.ok else response.error_message
+        except TRANSPORT_ERRORS as e:
+            error = e
+        if not error:
+            # A 2xx with an unexpected body still leaves nothing to attach the thread to
+            body = response.json()
+            wo_data = body.get("workorder") if isinstance(body, dict) else None
+            if not wo_data:
+                error = "API returned no work order data"
+        if error:
+            _spawn(thread.delete(reason="API call failed"), "rollback delete") # Tell the user without waiting on cleanup
+            await interaction.followup.send(f"Error creating work order in API: {error}", ephemeral=True)
             return
+        wo_id = wo_data.get("WorkOrderID")
+        cache_put("workorder", wo_id, wo_data)
 
-        # 3. Set Thread Topic
-        try:
-            await thread.edit(topic=f"WorkOrderID: {wo_id}")
-        except Exception as e:
-            print(f"UI WARNING: Could not set topic for thread {thread.id}: {e}")
-
-        # 4. Post the sticky message in the new thread
+        # 3. Set Thread Topic and post the sticky message in the new thread (independent, so together)
         embed = WorkOrderControlView.build_embed(wo_data)
-        view = WorkOrderControlView(api_url=self.API_BASE_URL, project_data=self.project_data, wo_data=wo_data)
-        control_message = await thread.send(embed=embed, view=view)
-        try:
-            await control_message.pin()
-        except discord.HTTPException as e:
-            print(f"UI WARNING: Could not pin work order control message in thread {thread.id}: {e}")
-        
-        # 5. Send confirmation
-        await interaction.followup.send(f"Success! Work order thread created: {thread.mention}", ephemeral=True)
-        await thread.send(f"Work order created by {interaction.user.mention}.")
+        view = WorkOrderControlView(api=self.api, project_data=self.project_data, wo_data=wo_data)
+        topic_result, control_message = await asyncio.gather(
+            thread.edit(topic=f"WorkOrderID: {wo_id}"),
+            thread.send(embed=embed, view=view),
+            return_exceptions=True
+        )
+        if isinstance(topic_result, Exception):
+            print(f"UI WARNING: Could not set topic for thread {thread.id}: {topic_result}")
+        if isinstance(control_message, Exception):
+            # The work order exists in the API by now, so keep the thread and say what's missing
+            print(f"UI ERROR: Could not post the control message in thread {thread.id}: {control_message}")
+            await interaction.followup.send(
+                f"Work order thread created: {thread.mention}, but its control message could not be posted: {control_message}",
+                ephemeral=True
+            )
+            return
+
+        # 4. Pin the sticky message and send the confirmations (independent, so together)
+        await _gather_logged(
+            control_message.pin(),
+            interaction.followup.send(f"Success! Work order thread created: {thread.mention}", ephemeral=True),
+            thread.send(f"Work order created by {interaction.user.mention}."),
+            description=f"Work order setup in thread {thread.id}"
+        )
 
 
 # --- ================================== ---
 # --- 3. WORK ORDER UI (INSIDE THREADS)
 # --- ================================== ---
 
+# Work order fields shown on the sticky message; if none changed, the message isn't re-sent
+_RENDER_FIELDS = ("WorkOrderID", "Title", "Deliverables", "Status", "PushedToUserID", "SubfolderURL", "TotalTimeSeconds", "CurrentStartTime")
+
+@functools.lru_cache(maxsize=512)
+def _start_timestamp(start_time_str: str) -> int:
+    """Parses a CurrentStartTime ISO string into a unix timestamp (once per distinct session)."""
+    return int(datetime.datetime.fromisoformat(start_time_str).timestamp())
+
+# _RENDER_FIELDS values -> rendered embed dict
+EMBED_CACHE_SIZE = 256
+_EMBED_CACHE = {}
+
+# action -> (label, style, row) of the buttons on the sticky message
+_WO_BUTTONS = {
+    "start": ("Start", discord.ButtonStyle.green, 0),
+    "edit": ("Edit Work Order", discord.ButtonStyle.grey, 0),
+    "cancel": ("Cancel", discord.ButtonStyle.red, 0),
+    "pause": ("Pause", discord.ButtonStyle.secondary, 1),
+    "finish": ("Finish", discord.ButtonStyle.green, 1),
+    "approve": ("Approve", discord.ButtonStyle.green, 2),
+    "rework": ("Rework", discord.ButtonStyle.red, 2),
+}
+
+class WorkOrderActionButton(ui.DynamicItem[ui.Button], template=r"wo_(?P<action>start|edit|cancel|pause|finish|approve|rework):(?P<wo_id>.+)"):
+    """A work order button that carries its WorkOrderID in the custom_id.
+
+    Registered once with client.add_dynamic_items, so clicks on any sticky message
+    (including ones sent before a restart) are routed here without a per-WO view.
+    """
+    api: ApiClient = None # Set by register_work_order_buttons
+
+    def __init__(self, action: str, wo_id: str):
+        label, style, row = _WO_BUTTONS[action]
+        super().__init__(ui.Button(label=label, style=style, row=row, custom_id=f"wo_{action}:{wo_id}"))
+        self.action = action
+        self.wo_id = wo_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: Interaction, item: ui.Button, match):
+        return cls(match["action"], match["wo_id"])
+
+    async def _load(self) -> tuple[Optional[dict], dict]:
+        wo_data = await self.api.fetch_work_order(self.wo_id)
+        if not wo_data:
+            return None, {}
+        return wo_data, await self.api.fetch_project(wo_data.get("ProjectID")) or {}
+
+    async def callback(self, interaction: Interaction):
+        # Look up within the ack deadline so the handler can answer (or reject) the click
+        # with its first response; slow lookups fall back to a defer
+        if self.action in {"edit", "cancel"}:
+            defer_kwargs = {"ephemeral": True, "thinking": True}
+        else:
+            defer_kwargs = {}
+        try:
+            wo_data, project_data = await _await_or_defer(interaction, self._load(), **defer_kwargs)
+        except TRANSPORT_ERRORS as e:
+            await _send_ephemeral(interaction, f"Error: Could not load work order data: {e}")
+            return
+
+        if not wo_data:
+            await _send_ephemeral(interaction, "Error: Could not find work order data.")
+            return
+
+        view = WorkOrderControlView(api=self.api, project_data=project_data, wo_data=wo_data)
+        await getattr(view, f"{self.action}_button")(interaction)
+
+def register_work_order_buttons(client: discord.Client, api: ApiClient):
+    """Routes every work order button click to WorkOrderActionButton."""
+    WorkOrderActionButton.api = api
+    client.add_dynamic_items(WorkOrderActionButton)
+
 class WorkOrderControlView(ui.View):
     """Persistent view for the sticky message in a Work Order Thread."""
-    def __init__(self, api_url: str, project_data: dict, wo_data: dict):
+    # Buttons shown for each status; statuses sharing a button set share the tuple
+    _OPEN_ACTIONS = ("start", "edit", "cancel")
+    _STATUS_ACTIONS = {
+        "Open": _OPEN_ACTIONS,
+        "Rework": _OPEN_ACTIONS,
+        "InProgress": ("pause", "finish"),
+        "InQA": ("approve", "rework"),
+    }
+
+    def __init__(self, api: ApiClient, project_data: dict, wo_data: dict):
         super().__init__(timeout=None)
-        self.API_BASE_URL = api_url
-        self.project_data = project_data
+        self.api = api
+        self.accountable_id = str(project_data.get("AccountableID") or "") # All the handlers need from the project
         self.wo_data = wo_data
         self.wo_id = wo_data.get("WorkOrderID")
-        
-        # Set all custom IDs
-        self.children[0].custom_id = f"wo_start:{self.wo_id}"
-        self.children[1].custom_id = f"wo_edit:{self.wo_id}"
-        self.children[2].custom_id = f"wo_cancel:{self.wo_id}"
-        self.children[3].custom_id = f"wo_pause:{self.wo_id}"
-        self.children[4].custom_id = f"wo_finish:{self.wo_id}"
-        self.children[5].custom_id = f"wo_approve:{self.wo_id}"
-        self.children[6].custom_id = f"wo_rework:{self.wo_id}"
+        # Views are built per click from the state the sticky message shows, so that is the
+        # baseline a re-render is compared against
+        self._last_render_sig = tuple(wo_data.get(key) for key in _RENDER_FIELDS)
+        self._shown_buttons = None # (actions, wo_id) currently on the view
         
         # Show/Hide buttons based on status
         status = wo_data.get("Status")
         self.toggle_buttons(status)
 
-    def toggle_buttons(self, status: str):
-        """Shows/hides buttons based on WO status."""
-        all_buttons = (
-            self.start_button,
-            self.edit_button,
-            self.cancel_button,
-            self.pause_button,
-            self.finish_button,
-            self.approve_button,
-            self.rework_button
-        )
+    def _render_changed(self) -> bool:
+        """Returns True (and remembers the new state) if the sticky message needs re-rendering."""
+        sig = tuple(self.wo_data.get(key) for key in _RENDER_FIELDS)
+        if sig == self._last_render_sig:
+            return False
+        self._last_render_sig = sig
+        return True
 
-        for button in all_buttons:
-            button.disabled = True
+    def toggle_buttons(self, status: str) -> bool:
+        """Shows/hides buttons based on WO status. Returns False if the buttons didn't change."""
+        actions = self._STATUS_ACTIONS.get(status, ())
+        shown = (actions, self.wo_id)
+        if shown == self._shown_buttons:
+            return False # Same button set already on the view (e.g. Open -> Rework)
+        self._shown_buttons = shown
 
         self.clear_items()
-
-        if status in {"Open", "Rework"}:
-            for button in all_buttons[:3]:
-                button.disabled = False
-                self.add_item(button)
-        elif status == "InProgress":
-            for button in all_buttons[3:5]:
-                button.disabled = False
-                self.add_item(button)
-        elif status == "InQA":
-            for button in all_buttons[5:]:
-                button.disabled = False
-                self.add_item(button)
+        for action in actions:
+            self.add_item(WorkOrderActionButton(action, self.wo_id))
+        return True
 
     @staticmethod
     def build_embed(wo_data: dict) -> discord.Embed:
-        """Helper to build the sticky work order embed."""
+        """Helper to build the sticky work order embed (memoized on the displayed fields)."""
+        key = tuple(wo_data.get(field) for field in _RENDER_FIELDS)
+        cached = _EMBED_CACHE.get(key)
+        if cached is None:
+            cached = WorkOrderControlView._render_embed(wo_data).to_dict()
+            if len(_EMBED_CACHE) >= EMBED_CACHE_SIZE:
+                _EMBED_CACHE.pop(next(iter(_EMBED_CACHE)))
+            _EMBED_CACHE[key] = cached
+        # Hand out a fresh copy so callers can't mutate the cached one
+        return discord.Embed.from_dict(cached)
+
+    @staticmethod
+    def _render_embed(wo_data: dict) -> discord.Embed:
         status = wo_data.get("Status", "N/A")
         embed = discord.Embed(
             title=f"Work Order: {wo_data.get('Title', 'N/A')}",
@@ -593,240 +880,192 @@ class WorkOrderControlView(ui.View):
         if pushed_to:
             embed.add_field(name="Assigned To", value=f"<@{pushed_to}> (Training)")
             
-        # Add Timer
+        # Add Timer (logged time only changes on start/pause/finish; the running
+        # session is a Discord relative timestamp that ticks on the client)
         total_sec = int(float(wo_data.get('TotalTimeSeconds', 0)))
+        timer_str = f"{total_sec // 3600:02}:{total_sec // 60 % 60:02}:{total_sec % 60:02}"
+        embed.add_field(name="Total Time Logged", value=timer_str)
+
         if status == "InProgress":
             start_time_str = wo_data.get('CurrentStartTime')
             if start_time_str:
-                start_time = datetime.datetime.fromisoformat(start_time_str)
-                time_spent = (datetime.datetime.now(datetime.timezone.utc) - start_time).total_seconds()
-                total_sec += int(time_spent)
-        
-        hours, remainder = divmod(total_sec, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        timer_str = f"{hours:02}:{minutes:02}:{seconds:02}"
-        embed.add_field(name="Total Time Logged", value=timer_str)
+                start_ts = _start_timestamp(start_time_str)
+                embed.add_field(name="Current Session", value=f"Started <t:{start_ts}:R>")
 
         embed.set_footer(text=f"WorkOrderID: {wo_data.get('WorkOrderID', 'N/A')}")
         return embed
 
-    # --- ROW 1: OPEN ---
-    @ui.button(label="Start", style=discord.ButtonStyle.green, custom_id="wo_start_base", row=0)
-    async def start_button(self, interaction: Interaction, button: ui.Button):
-        await interaction.response.defer()
-        
-        # 1. Check if this is a Pushed WO
-        pushed_to = self.wo_data.get("PushedToUserID")
-        if pushed_to and str(interaction.user.id) != str(pushed_to):
-            await interaction.followup.send(f"This is a training WO assigned to <@{pushed_to}>. Only they can start it.", ephemeral=True)
-            return
-
+    async def _apply_transition(
+        self,
+        interaction: Interaction,
+        action: str,
+        error_label: str,
+        payload: Optional[dict] = None,
+        followup: Optional[str] = None,
+        worker: Optional[discord.Member] = None
+    ) -> bool:
+        """PUTs a status transition and renders the state the API returns: sticky message,
+        thread title and an optional follow-up message. Returns False if it failed."""
+        # Only apply the transition to the state the user was looking at (e.g. not twice on a double click)
+        etag = etag_for("workorder", self.wo_id, self.wo_data)
+        wo_id = self.wo_id
+        if wo_id in _BUSY_WORK_ORDERS:
+            await _send_ephemeral(interaction, BUSY_MESSAGE)
+            return False
+        _BUSY_WORK_ORDERS.add(wo_id)
         try:
-            # 2. Call API
-            payload = {"UserID": str(interaction.user.id)}
-            requests.put(f"{self.API_BASE_URL}/workorder/{self.wo_id}/start", json=payload).raise_for_status()
-
-            # 3. Update local cache & thread title
-            response = requests.get(f"{self.API_BASE_URL}/workorder/{self.wo_id}")
-            response.raise_for_status()
-            new_data = response.json().get("workorder", {})
-
-            self.wo_data = new_data
+            # Defers only if the API call runs long, so a quick one is answered by the message edit
+            call = self.api.transition(self.wo_id, action, payload, if_match=etag)
+            response = await _await_or_defer(interaction, call)
+            if response.status == 412:
+                # Changed underneath us: show the current state instead of an error
+                followup = "This work order was already updated; showing its current state."
+            elif not response.ok:
+                await _send_ephemeral(interaction, f"{error_label}: {response.error_message}")
+                return False
+
+            # With If-Match the API sends only the changed fields, otherwise (or on a 412) the whole row
+            self.wo_data = {**self.wo_data, **response.json().get("workorder", {})}
             self.wo_id = self.wo_data.get("WorkOrderID", self.wo_id)
+            cache_put("workorder", self.wo_id, self.wo_data, etag=response.headers.get("ETag"))
+
+            updates = []
+            if self._render_changed():
+                # Only resend the components when the button set actually changed
+                edit = {"embed": self.build_embed(self.wo_data)}
+                if self.toggle_buttons(self.wo_data.get("Status")):
+                    edit["view"] = self
+                if interaction.response.is_done():
+                    updates.append(interaction.edit_original_response(**edit))
+                else:
+                    await interaction.response.edit_message(**edit)
+            else:
+                await _defer(interaction)
+
+            if response.status != 412:
+                # A 412 means someone else's change is showing; its title is theirs to set
+                _schedule_rename(interaction.channel, format_thread_title(self.wo_data, worker=worker))
+
+            if followup:
+                updates.append(interaction.followup.send(followup, ephemeral=response.status == 412))
+            await _gather_logged(*updates, description=f"{action} update")
+            return response.ok
+        except _REQUEST_ERRORS as e:
+            await _send_ephemeral(interaction, f"{error_label}: {e}")
+            return False
+        finally:
+            _BUSY_WORK_ORDERS.discard(wo_id)
 
-            new_title = format_thread_title(self.wo_data, worker=interaction.user)
-            await interaction.channel.edit(name=new_title[:100])
-
-            # 4. Update Message (will be done by loop, but we do it once for responsiveness)
-
-            embed = self.build_embed(self.wo_data)
-            self.toggle_buttons(self.wo_data.get("Status"))
-            await interaction.edit_original_response(embed=embed, view=self)
-
-        except Exception as e:
-            await interaction.followup.send(f"Error starting task: {e}", ephemeral=True)
+    # --- Button handlers (dispatched by WorkOrderActionButton; the click may not be acknowledged yet) ---
+    async def start_button(self, interaction: Interaction):
+        # Pushed (training) WOs can only be started by their assignee
+        pushed_to = self.wo_data.get("PushedToUserID")
+        if pushed_to and str(interaction.user.id) != str(pushed_to):
+            await _send_ephemeral(interaction, f"This is a training WO assigned to <@{pushed_to}>. Only they can start it.")
+            return
+        await self._apply_transition(
+            interaction, "start", "Error starting task",
+            payload={"UserID": str(interaction.user.id)}, worker=interaction.user
+        )
 
-    @ui.button(label="Edit Work Order", style=discord.ButtonStyle.grey, custom_id="wo_edit_base", row=0)
-    async def edit_button(self, interaction: Interaction, button: ui.Button):
+    async def edit_button(self, interaction: Interaction):
         # TODO: Add permissions check (creator or accountable)
         prompt_view = WorkOrderEditPromptView(control_view=self, original_message=interaction.message)
-        await interaction.response.send_message(
+        await _send_ephemeral(
+            interaction,
             "Update the assignee before editing the work order details.",
-            ephemeral=True,
             view=prompt_view
         )
 
-    @ui.button(label="Cancel", style=discord.ButtonStyle.red, custom_id="wo_cancel_base", row=0)
-    async def cancel_button(self, interaction: Interaction, button: ui.Button):
+    async def cancel_button(self, interaction: Interaction):
         confirm_view = WorkOrderCancelConfirmView(
             control_view=self,
             original_message=interaction.message
         )
 
-        await interaction.response.send_message(
-            "Are you sure?",
-            ephemeral=True,
-            view=confirm_view
-        )
+        await _send_ephemeral(interaction, "Are you sure?", view=confirm_view)
 
     async def cancel_work_order_confirm(self, interaction: Interaction, original_message: discord.Message) -> bool:
+        wo_id = self.wo_id
+        if wo_id in _BUSY_WORK_ORDERS:
+            await interaction.followup.send(BUSY_MESSAGE, ephemeral=True)
+            return False
+        _BUSY_WORK_ORDERS.add(wo_id)
         try:
             # Update backend status first to ensure all clients see the cancellation.
-            response = requests.put(f"{self.API_BASE_URL}/workorder/{self.wo_id}/cancel")
-            response.raise_for_status()
+            response = await self.api.transition(self.wo_id, "cancel", if_match=etag_for("workorder", self.wo_id, self.wo_data))
+            if not response.ok and response.status != 412:
+                await interaction.followup.send(f"Error cancelling work order: {response.error_message}", ephemeral=True)
+                return False
 
-            # Refresh local data from the source of truth.
-            wo_response = requests.get(f"{self.API_BASE_URL}/workorder/{self.wo_id}")
-            wo_response.raise_for_status()
-            new_data = wo_response.json().get("workorder", {})
+            # Merge in what the API returned (the changed fields, or the whole row without If-Match or on a 412)
+            new_data = response.json().get("workorder", {})
             if new_data:
-                self.wo_data = new_data
+                self.wo_data = {**self.wo_data, **new_data}
                 self.wo_id = self.wo_data.get("WorkOrderID", self.wo_id)
+                cache_put("workorder", self.wo_id, self.wo_data, etag=response.headers.get("ETag"))
+
+            if self._render_changed():
+                edit = {"embed": self.build_embed(self.wo_data)}
+                if self.toggle_buttons(self.wo_data.get("Status")):
+                    edit["view"] = self
+                await original_message.edit(**edit)
+
+            if response.status == 412:
+                # Changed underneath us: the sticky now shows the current state, nothing was cancelled
+                await interaction.followup.send(
+                    f"This work order was already updated (now {self.wo_data.get('Status')}); showing its current state.",
+                    ephemeral=True
+                )
+                return False
 
-            await interaction.channel.edit(name=f"❌ (Cancelled) {self.wo_data.get('Title')}"[:100])
             await interaction.channel.send(f"Work order cancelled by {interaction.user.mention}.")
-
-            embed = self.build_embed(self.wo_data)
-            self.toggle_buttons(self.wo_data.get("Status"))
-
-            await original_message.edit(embed=embed, view=self)
+            _schedule_rename(interaction.channel, f"❌ (Cancelled) {self.wo_data.get('Title')}")
             return True
-        except Exception as e:
+        except _REQUEST_ERRORS as e:
             await interaction.followup.send(f"Error cancelling work order: {e}", ephemeral=True)
             return False
+        finally:
+            _BUSY_WORK_ORDERS.discard(wo_id)
 
-    # --- ROW 2: IN-PROGRESS ---
-    @ui.button(label="Pause", style=discord.ButtonStyle.secondary, custom_id="wo_pause_base", row=1)
-    async def pause_button(self, interaction: Interaction, button: ui.Button):
-        await interaction.response.defer()
-        
-        # 1. Check if user is the one working
+    async def pause_button(self, interaction: Interaction):
         if str(interaction.user.id) != str(self.wo_data.get("InProgressUserID")):
-            await interaction.followup.send(f"Only the user working on this task can pause it.", ephemeral=True)
+            await _send_ephemeral(interaction, f"Only the user working on this task can pause it.")
             return
-            
-        try:
-            # 2. Call API
-            requests.put(f"{self.API_BASE_URL}/workorder/{self.wo_id}/pause").raise_for_status()
-
-            # 3. Update Thread Title
-            response = requests.get(f"{self.API_BASE_URL}/workorder/{self.wo_id}")
-            new_data = response.json().get("workorder", {})
-            self.wo_data = new_data
-            self.wo_id = self.wo_data.get("WorkOrderID", self.wo_id)
-
-            new_title = format_thread_title(self.wo_data)
-            await interaction.channel.edit(name=new_title[:100])
-
-            # 4. Update Message
-            embed = self.build_embed(self.wo_data)
-            self.toggle_buttons(self.wo_data.get("Status"))
-            await interaction.edit_original_response(embed=embed, view=self)
-
-        except Exception as e:
-            await interaction.followup.send(f"Error pausing task: {e}", ephemeral=True)
+        await self._apply_transition(interaction, "pause", "Error pausing task")
 
-    @ui.button(label="Finish", style=discord.ButtonStyle.green, custom_id="wo_finish_base", row=1)
-    async def finish_button(self, interaction: Interaction, button: ui.Button):
-        await interaction.response.defer()
-        
-        # 1. Check if user is the one working
+    async def finish_button(self, interaction: Interaction):
         if str(interaction.user.id) != str(self.wo_data.get("InProgressUserID")):
-            await interaction.followup.send(f"Only the user working on this task can finish it.", ephemeral=True)
+            await _send_ephemeral(interaction, f"Only the user working on this task can finish it.")
             return
-            
-        try:
-            # 2. Call API
-            payload = {"UserID": str(interaction.user.id)}
-            requests.put(f"{self.API_BASE_URL}/workorder/{self.wo_id}/finish", json=payload).raise_for_status()
-
-            # 3. Update Thread Title & Message
-            response = requests.get(f"{self.API_BASE_URL}/workorder/{self.wo_id}")
-            new_data = response.json().get("workorder", {})
-            self.wo_data = new_data
-            self.wo_id = self.wo_data.get("WorkOrderID", self.wo_id)
-
-            new_title = format_thread_title(self.wo_data)
-            await interaction.channel.edit(name=new_title[:100])
-
-            embed = self.build_embed(self.wo_data)
-            self.toggle_buttons(self.wo_data.get("Status"))
-            await interaction.edit_original_response(embed=embed, view=self)
-
-            # 4. Ping Accountable Person
-            accountable_id = self.wo_data.get("AccountableID") or self.project_data.get("AccountableID")
-            await interaction.followup.send(f"<@{accountable_id}>, this work order is finished and ready for your approval.")
-
-        except Exception as e:
-            await interaction.followup.send(f"Error finishing task: {e}", ephemeral=True)
+        # Ping the Accountable person once it's in QA
+        accountable_id = self.wo_data.get("AccountableID") or self.accountable_id
+        await self._apply_transition(
+            interaction, "finish", "Error finishing task",
+            payload={"UserID": str(interaction.user.id)},
+            followup=f"<@{accountable_id}>, this work order is finished and ready for your approval."
+        )
 
-    # --- ROW 3: IN-QA ---
-    @ui.button(label="Approve", style=discord.ButtonStyle.green, custom_id="wo_approve_base", row=2)
-    async def approve_button(self, interaction: Interaction, button: ui.Button):
-        await interaction.response.defer()
-        
-        # 1. Check if user is Accountable
-        if str(interaction.user.id) != str(self.project_data.get("AccountableID")):
-            await interaction.followup.send(f"Only the Project Accountable (<@{self.project_data.get('AccountableID')}>) can approve this.", ephemeral=True)
+    async def approve_button(self, interaction: Interaction):
+        if str(interaction.user.id) != self.accountable_id:
+            await _send_ephemeral(interaction, f"Only the Project Accountable (<@{self.accountable_id}>) can approve this.")
             return
+        # The transition clears the submitter, so address them from the current state
+        submitter_id = self.wo_data.get("QA_SubmittedByID")
+        await self._apply_transition(
+            interaction, "approve", "Error approving task",
+            followup=f"Work order approved! Great job <@{submitter_id}>."
+        )
 
-        try:
-            # 2. Call API
-            requests.put(f"{self.API_BASE_URL}/workorder/{self.wo_id}/approve").raise_for_status()
-
-            # 3. Update Thread Title & Message
-            response = requests.get(f"{self.API_BASE_URL}/workorder/{self.wo_id}")
-            new_data = response.json().get("workorder", {})
-            self.wo_data = new_data
-            self.wo_id = self.wo_data.get("WorkOrderID", self.wo_id)
-
-            new_title = format_thread_title(self.wo_data)
-            await interaction.channel.edit(name=new_title[:100])
-
-            embed = self.build_embed(self.wo_data)
-            self.toggle_buttons(self.wo_data.get("Status"))
-            for item in self.children: item.disabled = True # Disable all
-            await interaction.edit_original_response(embed=embed, view=self)
-
-            # 4. Post confirmation
-            submitter_id = self.wo_data.get("QA_SubmittedByID")
-            await interaction.followup.send(f"Work order approved! Great job <@{submitter_id}>.")
-
-        except Exception as e:
-            await interaction.followup.send(f"Error approving task: {e}", ephemeral=True)
-
-    @ui.button(label="Rework", style=discord.ButtonStyle.red, custom_id="wo_rework_base", row=2)
-    async def rework_button(self, interaction: Interaction, button: ui.Button):
-        await interaction.response.defer()
-        
-        # 1. Check if user is Accountable
-        if str(interaction.user.id) != str(self.project_data.get("AccountableID")):
-            await interaction.followup.send(f"Only the Project Accountable (<@{self.project_data.get('AccountableID')}>) can send this for rework.", ephemeral=True)
+    async def rework_button(self, interaction: Interaction):
+        if str(interaction.user.id) != self.accountable_id:
+            await _send_ephemeral(interaction, f"Only the Project Accountable (<@{self.accountable_id}>) can send this for rework.")
             return
-
-        try:
-            # 2. Call API
-            requests.put(f"{self.API_BASE_URL}/workorder/{self.wo_id}/rework").raise_for_status()
-
-            # 3. Update Thread Title & Message
-            response = requests.get(f"{self.API_BASE_URL}/workorder/{self.wo_id}")
-            new_data = response.json().get("workorder", {})
-            self.wo_data = new_data
-            self.wo_id = self.wo_data.get("WorkOrderID", self.wo_id)
-
-            new_title = format_thread_title(self.wo_data)
-            await interaction.channel.edit(name=new_title[:100])
-
-            embed = self.build_embed(self.wo_data)
-            self.toggle_buttons(self.wo_data.get("Status"))
-            await interaction.edit_original_response(embed=embed, view=self)
-
-            # 4. Post confirmation
-            submitter_id = self.wo_data.get("QA_SubmittedByID")
-            await interaction.followup.send(f"This work order has been sent back for rework. <@{submitter_id}>, please review.")
-
-        except Exception as e:
-            await interaction.followup.send(f"Error sending for rework: {e}", ephemeral=True)
+        submitter_id = self.wo_data.get("QA_SubmittedByID")
+        await self._apply_transition(
+            interaction, "rework", "Error sending for rework",
+            followup=f"This work order has been sent back for rework. <@{submitter_id}>, please review."
+        )
 
 
 class WorkOrderCancelConfirmView(ui.View):
@@ -855,19 +1094,17 @@ class WorkOrderCancelConfirmView(ui.View):
 class WorkOrderEditModal(ui.Modal, title='Edit Work Order'):
     def __init__(
         self,
-        api_url: str,
+        api: ApiClient,
         wo_data: dict,
-        project_data: dict,
         control_view: WorkOrderControlView,
         original_message: discord.Message,
         pushed_to_user_id: Optional[str],
         update_push: bool
     ):
         super().__init__(timeout=600)
-        self.API_BASE_URL = api_url
+        self.api = api
         self.wo_id = wo_data.get("WorkOrderID")
         self.wo_data = wo_data
-        self.project_data = project_data
         self.control_view = control_view
         self.original_message = original_message
         self.pushed_to_user_id = pushed_to_user_id
@@ -875,27 +1112,51 @@ class WorkOrderEditModal(ui.Modal, title='Edit Work Order'):
 
         self.title_input = ui.TextInput(
             label="Work Order Title",
-            default=wo_data.get("Title")
+            default=wo_data.get("Title"),
+            # Discord rejects a default longer than max_length; let older, longer titles be edited
+            max_length=max(WORK_ORDER_TITLE_MAX_LENGTH, len(str(wo_data.get("Title") or "")))
         )
         self.deliverables_input = ui.TextInput(
             label="Deliverables & Why",
             style=discord.TextStyle.paragraph,
-            default=wo_data.get("Deliverables")
+            default=wo_data.get("Deliverables"),
+            max_length=max(WORK_ORDER_DELIVERABLES_MAX_LENGTH, len(str(wo_data.get("Deliverables") or "")))
         )
         self.add_item(self.title_input)
         self.add_item(self.deliverables_input)
 
     async def on_submit(self, interaction: Interaction):
-        await interaction.response.defer(thinking=True, ephemeral=True)
+        # Catch blank input here rather than spending an API round trip on it
+        title = self.title_input.value.strip()
+        deliverables = self.deliverables_input.value.strip()
+        if not title or not deliverables:
+            await interaction.response.send_message("Title and deliverables can't be blank.", ephemeral=True)
+            return
+        # The inputs stretch to fit older, longer values; only new text has to fit the limits
+        for key, value, limit in (("Title", title, WORK_ORDER_TITLE_MAX_LENGTH), ("Deliverables", deliverables, WORK_ORDER_DELIVERABLES_MAX_LENGTH)):
+            if len(value) > limit and value != str(self.wo_data.get(key) or "").strip():
+                await interaction.response.send_message(f"{key} can be at most {limit} characters.", ephemeral=True)
+                return
         payload = {
-            "Title": self.title_input.value,
-            "Deliverables": self.deliverables_input.value
+            "Title": title,
+            "Deliverables": deliverables
         }
         if self.update_push:
             payload["PushedToUserID"] = self.pushed_to_user_id or ""
+        if all(str(self.wo_data.get(key) or "") == value for key, value in payload.items()):
+            await interaction.response.send_message("No changes to save.", ephemeral=True)
+            return
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        wo_id = self.wo_id
+        if wo_id in _BUSY_WORK_ORDERS:
+            await interaction.followup.send(BUSY_MESSAGE, ephemeral=True)
+            return
+        _BUSY_WORK_ORDERS.add(wo_id)
         try:
-            response = requests.put(f"{self.API_BASE_URL}/workorder/{self.wo_id}", json=payload)
-            response.raise_for_status()
+            response = await self.api.transition(self.wo_id, "update", payload)
+            if not response.ok:
+                await interaction.followup.send(f"Error updating work order: {response.error_message}", ephemeral=True)
+                return
             new_data = response.json().get("workorder", {})
 
             combined_data = dict(self.wo_data)
@@ -903,14 +1164,20 @@ class WorkOrderEditModal(ui.Modal, title='Edit Work Order'):
             self.wo_data = combined_data
             self.control_view.wo_data = combined_data
             self.control_view.wo_id = combined_data.get("WorkOrderID", self.control_view.wo_id)
-
-            embed = WorkOrderControlView.build_embed(self.control_view.wo_data)
-            self.control_view.toggle_buttons(self.control_view.wo_data.get("Status"))
-            await self.original_message.edit(embed=embed, view=self.control_view)
+            cache_put("workorder", self.control_view.wo_id, combined_data, etag=response.headers.get("ETag"))
 
             new_title = format_thread_title(self.control_view.wo_data)
-            await self.original_message.channel.edit(name=new_title[:100])
+            _schedule_rename(self.original_message.channel, new_title)
+
+            if self.control_view._render_changed():
+                edit = {"embed": WorkOrderControlView.build_embed(self.control_view.wo_data)}
+                if self.control_view.toggle_buttons(self.control_view.wo_data.get("Status")):
+                    edit["view"] = self.control_view
+                # The user only waits for the confirmation; the sticky catches up in the background
+                _spawn(self.original_message.edit(**edit), "work order sticky edit")
 
             await interaction.followup.send("Work order details updated!", ephemeral=True)
-        except Exception as e:
+        except _REQUEST_ERRORS as e:
             await interaction.followup.send(f"Error updating work order: {e}", ephemeral=True)
+        finally:
+            _BUSY_WORK_ORDERS.discard(wo_id)
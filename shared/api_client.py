@@ -0,0 +1,346 @@
+"""Shared HTTP session used by the bots to talk to the database API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import aiohttp
+
+try:
+    import orjson  # Optional: faster JSON encode/decode
+except ImportError:
+    orjson = None
+
+if orjson:
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+else:
+    _dumps = json.dumps
+    _loads = json.loads
+
+_session: aiohttp.ClientSession | None = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the process-wide aiohttp session, creating it on first use.
+
+    Must be called from inside the running event loop.
+    """
+    global _session
+    if _session is None or _session.closed:
+        # One keep-alive pool for every API call the bot makes
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=128, limit_per_host=64, keepalive_timeout=75),
+            json_serialize=_dumps
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared session (on bot shutdown) so pooled connections are released cleanly."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+# --- Lookup cache ---
+# Button handlers re-read the same project/work order the sticky message was just
+# rendered from; serve those reads from memory for a few seconds.
+CACHE_TTL_SECONDS = 10
+CACHE_MAX_SIZE = 512
+# Per-kind overrides: project metadata rarely changes between clicks, and every write
+# through the bots replaces the cached copy anyway
+CACHE_TTLS = {"project": 30}
+
+_cache: dict[tuple[str, str], tuple[float, dict]] = {}
+# Last (ETag, record) the API sent per record; outlives the TTL so an expired entry can be
+# revalidated with If-None-Match instead of downloaded again
+_validators: dict[tuple[str, str], tuple[str, dict]] = {}
+
+
+def cache_get(kind: str, item_id) -> dict | None:
+    """Return a cached record if it is still fresh."""
+    entry = _cache.get((kind, str(item_id)))
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        _cache.pop((kind, str(item_id)), None)
+        return None
+    return entry[1]
+
+
+def cache_put(kind: str, item_id, data: dict | None, etag: str | None = None) -> None:
+    """Store the latest known state of a record (e.g. straight from a write response)."""
+    if not item_id or not data:
+        return
+    key = (kind, str(item_id))
+    _cache.pop(key, None)
+    if len(_cache) >= CACHE_MAX_SIZE:
+        # Oldest insert goes first
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (time.monotonic() + CACHE_TTLS.get(kind, CACHE_TTL_SECONDS), data)
+    if etag:
+        _put_validator(key, etag, data)
+
+
+def etag_for(kind: str, item_id, data: dict) -> str | None:
+    """The ETag the API sent with exactly this record object, if any (for If-Match)."""
+    validator = _validators.get((kind, str(item_id)))
+    if validator and validator[1] is data:
+        return validator[0]
+    return None
+
+
+def _put_validator(key: tuple[str, str], etag: str, data: dict) -> None:
+    _validators.pop(key, None)
+    if len(_validators) >= CACHE_MAX_SIZE:
+        _validators.pop(next(iter(_validators)))
+    _validators[key] = (etag, data)
+
+
+# --- Rate-limited client ---
+MAX_CONCURRENT_REQUESTS = 16
+MAX_RETRIES = 3
+# Statuses that are retried in place (after Retry-After or a short backoff). A 502/503
+# can arrive after the server already committed, so only idempotent methods retry those;
+# a 429 was refused outright and is safe to retry for any method.
+RETRY_STATUSES = frozenset({429, 502, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+RETRY_BACKOFF_SECONDS = 0.5
+
+# Most work order transitions sent in one POST /workorders/batch
+BATCH_MAX_SIZE = 25
+
+# Errors that mean the API could not be reached at all; HTTP errors come back as statuses
+TRANSPORT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+def _retry_after(headers) -> float | None:
+    """Seconds from Retry-After / X-RateLimit-Reset-After, or None if absent or not a number
+    (e.g. the HTTP-date form of Retry-After)."""
+    value = headers.get("Retry-After") or headers.get("X-RateLimit-Reset-After")
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
+
+
+class ApiError(Exception):
+    """Raised by ApiResponse.raise_for_status() for 4xx/5xx responses."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class ApiResponse:
+    """A fully-read API response; the connection is already back in the pool."""
+
+    def __init__(self, status: int, headers, data):
+        self.status = status
+        self.headers = headers
+        self._data = data
+
+    def json(self):
+        return self._data
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def error_message(self) -> str:
+        """The API's error message for a failed response."""
+        message = self._data.get("message") if isinstance(self._data, dict) else None
+        return f"{self.status}: {message or 'API request failed'}"
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            message = self._data.get("message") if isinstance(self._data, dict) else None
+            raise ApiError(self.status, message or "API request failed")
+
+
+class ApiClient:
+    """Wraps the shared session with a concurrency cap and rate-limit bucket tracking.
+
+    Routes are grouped by the X-RateLimit-Bucket header when the server sends one.
+    A 429 (or an exhausted bucket) parks every caller of that bucket until the
+    Retry-After / X-RateLimit-Reset-After window passes, instead of each one
+    retrying on its own.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._route_buckets: dict[str, str] = {}
+        self._blocked_until: dict[str, float] = {}
+        self._transition_queue: list[tuple[dict, asyncio.Future]] = []
+        self._batch_task: asyncio.Task | None = None
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+    async def _wait_for_bucket(self, bucket: str) -> None:
+        delay = self._blocked_until.get(bucket, 0) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _block_bucket(self, bucket: str, seconds: float) -> None:
+        until = time.monotonic() + seconds
+        if until > self._blocked_until.get(bucket, 0):
+            self._blocked_until[bucket] = until
+
+    async def request(self, method: str, path: str, **kwargs) -> ApiResponse:
+        route = f"{method} {path}"
+        for attempt in range(MAX_RETRIES + 1):
+            bucket = self._route_buckets.get(route, route)
+            await self._wait_for_bucket(bucket)
+
+            async with self._semaphore:
+                async with get_session().request(method, f"{self.base_url}{path}", **kwargs) as response:
+                    body = await response.read()
+                    try:
+                        data = _loads(body) if body else None
+                    except ValueError:
+                        data = None
+                    status, headers = response.status, response.headers
+
+            bucket = headers.get("X-RateLimit-Bucket")
+            if bucket:
+                self._route_buckets[route] = bucket
+            else:
+                bucket = route
+
+            reset_after = _retry_after(headers)
+            if status == 429:
+                self._block_bucket(bucket, reset_after if reset_after is not None else 1)
+                if attempt < MAX_RETRIES:
+                    continue
+            elif status in RETRY_STATUSES:
+                # Gateway hiccup: only this call backs off, the bucket stays open
+                if attempt < MAX_RETRIES and method in IDEMPOTENT_METHODS:
+                    await asyncio.sleep(reset_after if reset_after is not None else RETRY_BACKOFF_SECONDS * 2 ** attempt)
+                    continue
+            elif headers.get("X-RateLimit-Remaining") == "0" and reset_after:
+                self._block_bucket(bucket, reset_after)
+
+            return ApiResponse(status, headers, data)
+
+    async def get(self, path: str, **kwargs) -> ApiResponse:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> ApiResponse:
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> ApiResponse:
+        return await self.request("PUT", path, **kwargs)
+
+    async def transition(self, wo_id, action: str, payload: dict | None = None, if_match: str | None = None) -> ApiResponse:
+        """Applies a work order status transition (start/pause/cancel/finish/approve/rework)
+        or an "update" of its editable fields.
+
+        A lone transition goes out straight away on its own endpoint; ones requested while
+        another send is in flight queue up and are sent together to /workorders/batch, so a
+        burst of clicks costs one round trip. The result looks like the matching PUT's response.
+        """
+        future = asyncio.get_running_loop().create_future()
+        item = {"WorkOrderID": str(wo_id), "Action": action, "Payload": payload or {}, "IfMatch": if_match}
+        self._transition_queue.append((item, future))
+        if self._batch_task is None or self._batch_task.done():
+            self._batch_task = asyncio.create_task(self._flush_transitions())
+        return await future
+
+    async def _put_transition(self, item: dict) -> ApiResponse:
+        path = f"/workorder/{item['WorkOrderID']}"
+        if item["Action"] != "update":
+            path += f"/{item['Action']}"
+        headers = {"If-Match": item["IfMatch"]} if item["IfMatch"] else None
+        return await self.put(path, json=item["Payload"], headers=headers)
+
+    async def _flush_transitions(self) -> None:
+        batch = []
+        try:
+            while self._transition_queue:
+                batch = self._transition_queue[:BATCH_MAX_SIZE]
+                del self._transition_queue[:BATCH_MAX_SIZE]
+                try:
+                    if len(batch) == 1:
+                        # Nothing to share the trip with; don't queue it behind the batch endpoint
+                        outcomes = [await self._put_transition(batch[0][0])]
+                    else:
+                        response = await self.post("/workorders/batch", json={"Transitions": [item for item, _ in batch]})
+                        results = response.json().get("results") if response.ok else None
+                        if not results or len(results) != len(batch):
+                            # The batch itself failed: every caller gets that response
+                            outcomes = [response] * len(batch)
+                        else:
+                            outcomes = [
+                                ApiResponse(result["StatusCode"], {"ETag": result["ETag"]} if result.get("ETag") else {}, result["Body"])
+                                for result in results
+                            ]
+                    for (_, future), outcome in zip(batch, outcomes):
+                        if not future.done():
+                            future.set_result(outcome)
+                except Exception as e:
+                    # Hand the failure to the waiting callers rather than leaving them hanging
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+        finally:
+            # Cancelled (e.g. on shutdown): nothing else will resolve these
+            for _, future in batch + self._transition_queue:
+                if not future.done():
+                    future.cancel()
+            self._transition_queue.clear()
+
+    async def _fetch(self, kind: str, item_id) -> dict | None:
+        cached = cache_get(kind, item_id)
+        if cached is not None:
+            return cached
+
+        # Concurrent lookups of the same record share one request
+        key = (kind, str(item_id))
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._load(kind, item_id))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, kind: str, item_id) -> dict | None:
+        key = (kind, str(item_id))
+        validator = _validators.get(key)
+        headers = {"If-None-Match": validator[0]} if validator else None
+        response = await self.get(f"/{kind}/{item_id}", headers=headers)
+        if response.status == 304 and validator:
+            data = validator[1] # Unchanged since we last saw it
+        elif response.status == 200:
+            data = response.json().get(kind, {})
+            etag = response.headers.get("ETag")
+            if etag:
+                _put_validator(key, etag, data)
+        else:
+            return None
+        cache_put(kind, item_id, data)
+        return data
+
+    async def fetch_project(self, project_id) -> dict | None:
+        """Return a project by ID, or None if the API doesn't know it."""
+        return await self._fetch("project", project_id)
+
+    async def fetch_work_order(self, wo_id) -> dict | None:
+        """Return a work order by ID, or None if the API doesn't know it."""
+        return await self._fetch("workorder", wo_id)
+
+
+_clients: dict[str, ApiClient] = {}
+
+
+def get_api(base_url: str) -> ApiClient:
+    """Return the process-wide ApiClient for a base URL so all callers share its limits."""
+    client = _clients.get(base_url)
+    if client is None:
+        client = _clients[base_url] = ApiClient(base_url)
+    return client
@@ -2,27 +2,45 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 import discord
 
+# Discord's limit on channel/thread names
+NAME_MAX_LENGTH = 100
+# Work order title length kept in thread names; leaves room for the status prefix
+TITLE_MAX_LENGTH = 80
+
+# Title templates per work order status; InProgress shows the worker instead of the time
+_IN_PROGRESS_TEMPLATE = "⏱️ (@{worker}) {title}"
+_TEMPLATES = {
+    "Approved": "✅ ({total}) {title}",
+    "InQA": "QA ➡️ ({total}) {title}",
+    "Open": "({total}) {title}",
+    "Rework": "({total}) {title}",
+}
+# Cancelled, Completed without approval, or any other status
+_DEFAULT_TEMPLATE = _TEMPLATES["Open"]
+
 
 def format_thread_title(wo_data: dict, worker: discord.Member | None = None) -> str:
-    """Build a work-order thread title following the shared rules."""
+    """Build a work-order thread title following the shared rules, within Discord's name limit."""
     status = wo_data.get("Status")
-    title = wo_data.get("Title", "Work Order")[:80]
-    total_sec = int(float(wo_data.get("TotalTimeSeconds", 0)))
-    hours, remainder = divmod(total_sec, 3600)
-    minutes, _ = divmod(remainder, 60)
-    total_time_str = f"{hours:02}:{minutes:02}"
+    title = wo_data.get("Title", "Work Order")
+    if status == "InProgress":
+        return format_thread_title_fast(status, title, 0, worker.name if worker else None)
+
+    total_sec = wo_data.get("TotalTimeSeconds", 0)
+    if not isinstance(total_sec, int):
+        total_sec = int(float(total_sec)) # Sheet values can arrive as strings
+    return format_thread_title_fast(status, title, total_sec, None)
+
 
+@lru_cache(maxsize=2048)
+def format_thread_title_fast(status: str | None, title: str, total_sec: int, worker_name: str | None) -> str:
+    """format_thread_title for callers that already hold the scalars (total_sec as an int)."""
+    title = title[:TITLE_MAX_LENGTH]
     if status == "InProgress":
-        name = worker.name if worker else "Working"
-        return f"⏱️ (@{name}) {title}"
-    if status == "Approved":
-        return f"✅ ({total_time_str}) {title}"
-    if status in {"Open", "Rework"}:
-        return f"({total_time_str}) {title}"
-    if status == "InQA":
-        return f"QA ➡️ ({total_time_str}) {title}"
-
-    # Cancelled, Completed without approval, or any other status
-    return f"({total_time_str}) {title}"
+        return _IN_PROGRESS_TEMPLATE.format(worker=worker_name or "Working", title=title)[:NAME_MAX_LENGTH]
+    total_time_str = f"{total_sec // 3600:02}:{total_sec % 3600 // 60:02}"
+    return _TEMPLATES.get(status, _DEFAULT_TEMPLATE).format(total=total_time_str, title=title)[:NAME_MAX_LENGTH]